@@ -0,0 +1,121 @@
+import os
+import unittest
+from src.CSRGraph import CSRGraph, KeyRange
+from src.DiGraph import DiGraph
+from src.GraphAlgo import GraphAlgo
+from graph_factory import random_digraph
+import random
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_from_digraph(self):
+        """
+        verify that the CSR snapshot holds the same vertices, edges and positions as the DiGraph
+        and that it can not be changed
+        """
+        g = DiGraph()
+        g.add_node(1, (1, 2, 0))
+        g.add_node(2)
+        g.add_node(3)
+        g.add_edge(1, 2, 12)
+        g.add_edge(1, 3, 13)
+        g.add_edge(2, 3, 23)
+        c = CSRGraph.from_digraph(g)
+        self.assertEqual(3, c.v_size())
+        self.assertEqual(3, c.e_size())
+        self.assertEqual(g.get_mc(), c.get_mc())
+        self.assertEqual([2, 3], list(c.all_out_edges_of_node(1)))
+        self.assertEqual([1, 2], list(c.all_in_edges_of_node(3)))
+        self.assertEqual({}, c.all_in_edges_of_node(1))
+        self.assertEqual(23, c.get_edge(2, 3).weight)
+        self.assertIsNone(c.get_edge(3, 2))
+        self.assertTrue(c.has_edge(1, 3))
+        self.assertFalse(c.has_edge(3, 1))
+        self.assertEqual((1, 2, 0), c.get_node(1).pos)
+        self.assertIsNone(c.get_node(2).pos)
+        self.assertIsNone(c.get_node(4))
+        self.assertEqual(c.get_all_v(), g.get_all_v())
+        self.assertFalse(c.add_node(4))  # read only
+        self.assertFalse(c.add_edge(3, 1, 1))
+        self.assertFalse(c.remove_edge(1, 2))
+        self.assertFalse(c.remove_node(1))
+        self.assertEqual(3, c.e_size())
+        g.add_node(0)
+        c = CSRGraph.from_digraph(g)  # keys 0..n-1, no dictionary index
+        self.assertEqual([2, 3], [key for key, w in c.out_arcs(1)])
+        for key in [-1, 4, "a"]:  # not wrapped around like a range index
+            self.assertIsNone(c.get_node(key))
+            self.assertFalse(c.has_edge(key, 1))
+            with self.assertRaises(KeyError):
+                c.out_arcs(key)
+            with self.assertRaises(KeyError):
+                c.in_arcs(key)
+            with self.assertRaises(KeyError):
+                c.all_out_edges_of_node(key)
+
+    def test_from_json(self):
+        """
+        verify that a CSRGraph built straight from json (both formats) equals the loaded DiGraph
+        """
+        for file_name in ["../data/A5", "../data/G_10_80_0.json", "../data/T0.json"]:
+            g = GraphAlgo()
+            self.assertTrue(g.load_from_json(file_name))
+            c = CSRGraph.from_json(file_name)
+            self.assertEqual(g.get_graph().v_size(), c.v_size())
+            self.assertEqual(g.get_graph().e_size(), c.e_size())
+            for key, node in g.get_graph().get_all_v().items():
+                self.assertEqual(node.pos, c.get_node(key).pos)
+                self.assertEqual(list(g.get_graph().all_out_edges_of_node(key)), list(c.all_out_edges_of_node(key)))
+
+    def test_algorithms(self):
+        """
+        verify that shortest_path and the SCC algorithms give the same results on a CSRGraph
+        as on the DiGraph it was built from
+        """
+        g = random_digraph(200, 600)
+        ga = GraphAlgo(g)
+        ca = GraphAlgo(CSRGraph.from_digraph(g))
+        self.assertEqual(ga.connected_components(), ca.connected_components())
+        self.assertEqual(ga.connected_component(7), ca.connected_component(7))
+        for key in range(0, 200, 7):
+            self.assertEqual(set(ga.connected_component(key)),
+                             set(GraphAlgo(CSRGraph.from_digraph(g)).connected_component(key, targeted=True)))
+        for i in range(50):
+            src, dest = random.randrange(200), random.randrange(200)
+            d1, p1 = ga.shortest_path(src, dest)
+            d2, p2 = ca.shortest_path(src, dest)
+            self.assertAlmostEqual(d1, d2)
+            self.assertEqual(len(p1) == 0, len(p2) == 0)
+            self.assertAlmostEqual(d1, ca.shortest_path(src, dest, method="bidirectional")[0])
+        self.assertEqual((float('inf'), []), ca.shortest_path(1, 500))
+
+    def test_open_mapped(self):
+        """
+        verify that a memory mapped snapshot answers like the graph it was saved from
+        """
+        file_name = "mapped_graph.bin"
+        g = random_digraph(100, 400)
+        ga = GraphAlgo(g)
+        self.assertTrue(ga.save_binary(file_name))
+        c = CSRGraph.open_mapped(file_name)
+        self.assertIsInstance(c.out_targets, memoryview)  # zero copy over the mapped file
+        self.assertIsInstance(c.index, KeyRange)  # the keys are 0..n-1, no dictionary
+        self.assertEqual(g.e_size(), c.e_size())
+        self.assertEqual(g.get_node(3).pos, c.get_node(3).pos)
+        self.assertEqual(g.all_in_edges_of_node(5).keys(), c.all_in_edges_of_node(5).keys())
+        ca = GraphAlgo(c)
+        self.assertEqual(ga.connected_components(), ca.connected_components())
+        for i in range(20):
+            src, dest = random.randrange(100), random.randrange(100)
+            self.assertAlmostEqual(ga.shortest_path(src, dest)[0], ca.shortest_path(src, dest)[0])
+        c.close()
+        mapped = GraphAlgo()
+        self.assertTrue(mapped.load_binary(file_name, mapped=True))
+        self.assertEqual(ga.connected_component(0), mapped.connected_component(0))
+        mapped.get_graph().close()
+        os.remove(file_name)
+
+
+if __name__ == '__main__':
+    unittest.main()
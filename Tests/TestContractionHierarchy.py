@@ -0,0 +1,89 @@
+import os
+import unittest
+from src.ContractionHierarchy import ContractionHierarchy
+from src.CSRGraph import CSRGraph
+from src.GraphAlgo import GraphAlgo
+from graph_factory import random_digraph
+import random
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_shortest_path(self):
+        """
+        verify that the hierarchy finds paths of the same weight as Dijkstra's algorithm and that
+        the unpacked paths are made of edges of the original graph
+        """
+        g = random_digraph(300, 900)
+        ga = GraphAlgo(g)
+        ch = ContractionHierarchy.build(g)
+        self.assertEqual(300, len(ch.rank))
+        for i in range(200):
+            src, dest = random.randrange(300), random.randrange(300)
+            dist, path = ch.shortest_path(src, dest)
+            self.assertAlmostEqual(ga.shortest_path(src, dest)[0], dist)
+            if path:
+                self.assertEqual(src, path[0])
+                self.assertEqual(dest, path[-1])
+                self.assertAlmostEqual(dist, sum(g.get_edge(u, v).weight for u, v in zip(path, path[1:])))
+        self.assertEqual((0.0, [5]), ch.shortest_path(5, 5))
+        self.assertEqual((float('inf'), []), ch.shortest_path(5, 500))
+        c = ContractionHierarchy.build(CSRGraph.from_digraph(g))  # any GraphInterface
+        self.assertAlmostEqual(ch.shortest_path(3, 8)[0], c.shortest_path(3, 8)[0])
+
+    def test_graph_algo(self):
+        """
+        verify the "ch" method of GraphAlgo: save and load of the hierarchy and the fallback once the graph changes
+        """
+        g = random_digraph(100, 400)
+        ga = GraphAlgo(g)
+        self.assertAlmostEqual(ga.shortest_path(1, 2)[0], ga.shortest_path(1, 2, method="ch")[0])  # no index yet
+        index = ga.preprocess_hierarchy()
+        self.assertAlmostEqual(ga.shortest_path(1, 2)[0], ga.shortest_path(1, 2, method="ch")[0])
+        file_name = "random_graph.ch"
+        self.assertTrue(ga.save_hierarchy(file_name))
+        e = GraphAlgo(g)
+        self.assertTrue(e.load_hierarchy(file_name))
+        self.assertEqual(index.rank, e.hierarchy.rank)
+        self.assertEqual(index.middle, e.hierarchy.middle)
+        for i in range(30):
+            src, dest = random.randrange(100), random.randrange(100)
+            self.assertEqual(index.shortest_path(src, dest), e.shortest_path(src, dest, method="ch"))
+        g.add_node(101)
+        g.add_edge(1, 101, 0.01)
+        self.assertEqual((0.01, [1, 101]), e.shortest_path(1, 101, method="ch"))  # stale index is dropped
+        self.assertIsNone(e.hierarchy)
+        self.assertFalse(e.load_hierarchy(file_name))
+        os.remove(file_name)
+
+    def test_replaced_graph(self):
+        """
+        verify that a hierarchy is not used for another graph of the same size and mode count,
+        in memory or from a file
+        """
+        a, b = random_digraph(200, 800), random_digraph(200, 800)
+        self.assertEqual((a.get_mc(), a.v_size(), a.e_size()), (b.get_mc(), b.v_size(), b.e_size()))
+        ga = GraphAlgo(a)
+        index = ga.preprocess_hierarchy()
+        file_name = "random_graph.ch"
+        self.assertTrue(ga.save_hierarchy(file_name))
+        self.assertFalse(index.is_valid_for(b))
+        gb = GraphAlgo(b)
+        gb.hierarchy = index  # an index of another graph object is not used
+        for i in range(50):
+            src, dest = random.randrange(200), random.randrange(200)
+            self.assertAlmostEqual(gb.shortest_path(src, dest, method="bidirectional")[0],
+                                   gb.shortest_path(src, dest, method="ch")[0])
+        self.assertFalse(gb.load_hierarchy(file_name))  # saved for the other graph
+        self.assertTrue(ga.save_binary("random_graph.bin"))
+        self.assertTrue(gb.load_binary("random_graph.bin"))  # a copy of the first graph
+        self.assertTrue(gb.load_hierarchy(file_name))
+        self.assertEqual(index.shortest_path(3, 8), gb.shortest_path(3, 8, method="ch"))
+        self.assertTrue(gb.load_binary("random_graph.bin"))
+        self.assertIsNone(gb.hierarchy)  # dropped with the old graph
+        os.remove(file_name)
+        os.remove("random_graph.bin")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -197,6 +197,87 @@ class MyTestCase(unittest.TestCase):
         g.remove_node(1)
         self.assertEqual(g.get_all_v(), {})
 
+    def test_bulk_insert(self):
+        """
+        add_nodes_from/add_edges_from follow the same rules as add_node/add_edge
+        and increase the mode count once per batch
+        """
+        g = DiGraph()
+        self.assertEqual(3, g.add_nodes_from([1, (2, (1, 2, 0)), 3]))
+        self.assertEqual(1, g.get_mc())
+        self.assertEqual((1, 2, 0), g.get_node(2).pos)
+        self.assertEqual(1, g.add_nodes_from([3, 4]))  # node 3 is already in the graph
+        self.assertEqual(2, g.get_mc())
+        self.assertEqual(4, g.v_size())
+        edges = [(1, 2, 12), (1, 3, 13), (1, 2, 5), (2, 2, 1), (1, 6, 1), (3, 1, -4), (2, 3, 23)]
+        self.assertEqual(3, g.add_edges_from(edges))  # duplicate, self loop, missing node and negative weight
+        self.assertEqual(3, g.get_mc())
+        self.assertEqual(3, g.e_size())
+        self.assertEqual(12, g.get_edge(1, 2).weight)
+        self.assertDictEqual({2: g.get_node(2), 3: g.get_node(3)}, g.all_out_edges_of_node(1))
+        self.assertDictEqual({1: g.get_node(1), 2: g.get_node(2)}, g.all_in_edges_of_node(3))
+        self.assertEqual(0, g.add_edges_from([(1, 2, 1)]))
+        self.assertEqual(3, g.get_mc())  # nothing was added, the mode count stays
+        self.assertTrue(g.remove_node(1))
+        self.assertEqual(1, g.e_size())
+
+    def test_changes_since(self):
+        """
+        verify that the change journal lists the changes made after a mode count, oldest first,
+        and that it tells when it does not go back far enough
+        """
+        g = DiGraph()
+        g.add_node(1)
+        g.add_node(2)
+        mc = g.get_mc()
+        g.add_edge(1, 2, 1)
+        g.add_nodes_from([3, 4])
+        g.remove_edge(1, 2)
+        g.remove_node(4)
+        self.assertEqual([("add_edge", 1, 2), ("add_node", 3, None), ("add_node", 4, None),
+                          ("remove_edge", 1, 2), ("remove_node", 4, None)],
+                         [change[1:] for change in g.changes_since(mc)])
+        self.assertEqual([], g.changes_since(g.get_mc()))
+        self.assertEqual(5, len(g.changes_since(0)) - 2)
+        g.add_nodes_from(range(10, 10 + 2 * DiGraph.journal_limit))  # larger than the journal
+        self.assertIsNone(g.changes_since(mc))
+        self.assertEqual([], g.changes_since(g.get_mc()))
+
+    def test_weight_range(self):
+        """
+        verify the weight bounds: they grow with add_edge and add_edges_from, stay after a removal
+        and start over once the graph has no edges
+        """
+        g = DiGraph()
+        self.assertEqual((float('inf'), 0.0), g.weight_range())
+        g.add_nodes_from(range(4))
+        g.add_edge(0, 1, 2.5)
+        self.assertEqual((2.5, 2.5), g.weight_range())
+        g.add_edges_from([(1, 2, 0.5), (2, 3, 7), (3, 0, -1)])  # the negative weight is skipped
+        self.assertEqual((0.5, 7), g.weight_range())
+        g.remove_edge(2, 3)
+        self.assertEqual((0.5, 7), g.weight_range())  # not narrowed
+        g.remove_edge(0, 1)
+        g.remove_node(2)
+        self.assertEqual(0, g.e_size())
+        self.assertEqual((float('inf'), 0.0), g.weight_range())
+
+    def test_slots(self):
+        """
+        NodeData and EdgeData are slotted - no per instance __dict__ and no algorithm fields
+        """
+        g = DiGraph()
+        g.add_node(1, pos=(1, 2, 0))
+        g.add_node(2)
+        g.add_edge(1, 2, 3)
+        self.assertFalse(hasattr(g.get_node(1), "__dict__"))
+        self.assertFalse(hasattr(g.get_edge(1, 2), "__dict__"))
+        self.assertFalse(hasattr(g.get_node(1), "visited"))
+        with self.assertRaises(AttributeError):
+            g.get_node(1).visited = True
+        g.get_node(2).pos = (5, 5, 0)  # the node fields can still be changed
+        self.assertEqual((5, 5, 0), g.get_node(2).pos)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,6 +1,11 @@
+import json
+import os
 import unittest
+from src.all_pairs_paths import AllPairsPaths
 from src.GraphAlgo import GraphAlgo
 from src.DiGraph import DiGraph
+from src.graph_json import JsonStream
+from src.indexed_heap import IndexedHeap
 from src.node_data import NodeData
 import random
 
@@ -86,6 +91,444 @@ class MyTestCase(unittest.TestCase):
         self.assertEqual((float('inf'), []),
                          g_4.shortest_path(1, 2))  # node 1 and 2 is in the graph with no path between them
 
+    def test_indexed_heap(self):
+        """
+        This test verify the decrease-key heap: items come out by priority (the smaller key first on ties),
+        every item is held once and a dijkstras run with it finds the same distances as with heapq
+        """
+        heap = IndexedHeap()
+        for item, priority in [(5, 3.0), (2, 1.0), (9, 1.0), (4, 7.0), (7, 2.0)]:
+            self.assertTrue(heap.push(item, priority))
+        self.assertFalse(heap.push(4, 8.0))  # not lower
+        self.assertTrue(heap.push(4, 1.0))  # decrease-key, no second entry
+        self.assertEqual(5, len(heap))
+        self.assertEqual(1.0, heap.peek())
+        order = [heap.pop() for i in range(len(heap))]
+        self.assertEqual([(1.0, 2), (1.0, 4), (1.0, 9), (2.0, 7), (3.0, 5)], order)
+        self.assertEqual(float('inf'), heap.peek())
+        self.assertNotIn(2, heap)
+        ga = graph_creator_with_edges(200, 1000)
+        g = ga.get_graph()
+        for src in random.sample(range(1, 201), 5):
+            dist, parent = ga.dijkstras(g.get_node(src), queue="indexed")
+            self.assertEqual(ga.dijkstras(g.get_node(src))[0], dist)
+            for key, p in parent.items():
+                if p is not None:
+                    self.assertAlmostEqual(dist[key], dist[p] + g.get_edge(p, key).weight)
+        dist, parent = ga.dijkstras(g.get_node(1), g.get_node(2), queue="indexed")
+        self.assertEqual(ga.shortest_path(1, 2)[0], dist.get(2, float('inf')))
+        with self.assertRaises(ValueError):
+            ga.dijkstras(g.get_node(1), queue="fibonacci")
+
+    def test_dijkstras_buckets(self):
+        """
+        This test verify Dial's buckets: the same distances as the heapq queue, and that they are chosen
+        only when the weight range of the graph allows it (no zero weight, max / min within bucket_limit)
+        """
+        ga = graph_creator_with_edges(300, 1500)
+        g = ga.get_graph()
+        for src in random.sample(range(1, 301), 5):
+            dist, parent = ga.dijkstras(g.get_node(src), queue="buckets")
+            expected = ga.dijkstras(g.get_node(src), queue="heapq")[0]
+            self.assertEqual(expected.keys(), dist.keys())
+            for key, p in parent.items():
+                self.assertAlmostEqual(expected[key], dist[key])
+                if p is not None:
+                    self.assertAlmostEqual(dist[key], dist[p] + g.get_edge(p, key).weight)
+        dist, parent = ga.dijkstras(g.get_node(1), g.get_node(2), queue="buckets")
+        self.assertAlmostEqual(ga.shortest_path(1, 2, method="bidirectional")[0], dist.get(2, float('inf')))
+        e = DiGraph()
+        e.add_nodes_from(range(4))
+        e.add_edges_from([(0, 1, 0), (1, 2, 3), (0, 2, 5), (2, 3, 1)])  # a zero weight - no buckets
+        ea = GraphAlgo(e)
+        self.assertEqual(({0: 0, 1: 0, 2: 3, 3: 4}, {0: None, 1: 0, 2: 1, 3: 2}),
+                         ea.dijkstras(e.get_node(0), queue="buckets"))
+        e.remove_edge(0, 1)
+        e.add_edge(0, 1, 5 * GraphAlgo.bucket_limit)  # too wide a range
+        self.assertEqual({0: 0, 1: 5 * GraphAlgo.bucket_limit, 2: 5, 3: 6}, ea.dijkstras(e.get_node(0))[0])
+        e.remove_edge(0, 1)
+        e.add_edge(0, 1, 2)
+        self.assertEqual({0: 0, 1: 2, 2: 5, 3: 6}, ea.dijkstras(e.get_node(0))[0])
+        self.assertEqual((6, [0, 2, 3]), ea.shortest_path(0, 3))
+        n = 20000  # a long path of alternating 1 and 4000 weights - almost every bucket on the way is empty
+        chain = DiGraph()
+        chain.add_nodes_from(range(n))
+        chain.add_edges_from((v, v + 1, 1 if v % 2 else 4000) for v in range(n - 1))
+        ca = GraphAlgo(chain)
+        expected = ca.dijkstras(chain.get_node(0), chain.get_node(n - 1), queue="heapq")[0]
+        dist = ca.dijkstras(chain.get_node(0), chain.get_node(n - 1))[0]  # buckets are picked
+        self.assertEqual(expected[n - 1], dist[n - 1])
+        self.assertEqual(n // 2 * 4001 - 1, dist[n - 1])
+        cycle = DiGraph()  # 0.3 + 0.7 is rounded past the last bucket of a ring of 0.7 // 0.1 + 2 buckets
+        cycle.add_nodes_from(range(3))
+        cycle.add_edges_from([(0, 1, 0.3), (1, 2, 0.7), (2, 0, 0.1)])
+        self.assertEqual((1.0, [0, 1, 2]), GraphAlgo(cycle).shortest_path(0, 2))
+        self.assertEqual((1.0, [0, 1, 2]), GraphAlgo(cycle).shortest_path_tree(0).path(2))
+        for i in range(500):  # weights whose sums are not exact
+            small = DiGraph()
+            small.add_nodes_from(range(6))
+            small.add_edges_from((random.randrange(6), random.randrange(6), random.choice([0.1, 0.3, 0.7]))
+                                 for j in range(12))
+            sa = GraphAlgo(small)
+            dist = sa.dijkstras(small.get_node(0), queue="buckets")[0]
+            expected = sa.dijkstras(small.get_node(0), queue="heapq")[0]
+            self.assertEqual(expected.keys(), dist.keys())
+            for key in dist:
+                self.assertAlmostEqual(expected[key], dist[key])
+
+    def test_within_distance_and_k_nearest(self):
+        """
+        This test verify the bounded searches against a full Dijkstra's run: the same nodes and distances,
+        in increasing distance, and that they are lazy generators
+        """
+        ga = graph_creator_with_edges(300, 1500)
+        g = ga.get_graph()
+        for src in random.sample(range(1, 301), 5):
+            full = ga.dijkstras(g.get_node(src), queue="heapq")[0]
+            ranked = sorted(full.items(), key=lambda item: (item[1], item[0]))
+            radius = ranked[len(ranked) // 3][1]
+            within = list(ga.within_distance(src, radius))
+            self.assertEqual([item for item in ranked if item[1] <= radius], within)
+            self.assertEqual((src, 0.0), within[0])
+            self.assertEqual(ranked[1:11], list(ga.k_nearest(src, 10)))
+            self.assertEqual(ranked[1:], list(ga.k_nearest(src, 1000)))  # fewer nodes than k
+        src = next(key for key in g.get_all_v() if g.all_out_edges_of_node(key))
+        search = ga.within_distance(src, float('inf'))  # nothing runs until the first node is asked for
+        self.assertEqual((src, 0.0), next(search))
+        key, dist = next(search)
+        self.assertAlmostEqual(ga.shortest_path(src, key)[0], dist)
+        self.assertEqual([], list(ga.within_distance(1000, 5)))
+        self.assertEqual([], list(ga.k_nearest(1000, 5)))
+        self.assertEqual([], list(ga.k_nearest(1, 0)))
+
+    def test_shortest_path_tree(self):
+        """
+        This test verify that one shortest_path_tree from a source answers the same
+        as shortest_path for every destination in the graph
+        """
+        g = graph_creator_with_edges(60, 300)
+        tree = g.shortest_path_tree(1)
+        for dest in g.get_graph().get_all_v():
+            self.assertEqual(g.shortest_path(1, dest), tree.path(dest))
+            self.assertEqual(g.shortest_path(1, dest)[0], tree.distance(dest))
+        self.assertEqual((0.0, [1]), tree.path(1))
+        self.assertIsNone(g.shortest_path_tree(100))  # node 100 is not in the graph
+        g_1 = graph_creator(3)
+        g_1.get_graph().add_edge(1, 2, 4)
+        tree = g_1.shortest_path_tree(1)
+        self.assertTrue(tree.has_path(2))
+        self.assertFalse(tree.has_path(3))  # there is no path from 1 to 3
+        self.assertEqual((float('inf'), []), tree.path(3))
+
+    def test_shortest_path_bidirectional(self):
+        """
+        This test verify that the bidirectional search finds paths of the same weight as the forward search
+        and that the returned path is a real path in the graph with that weight
+        """
+        g = graph_creator_with_edges(150, 500)
+        for i in range(100):
+            src, dest = random.randint(1, 150), random.randint(1, 150)
+            dist, path = g.shortest_path(src, dest)
+            b_dist, b_path = g.shortest_path(src, dest, method="bidirectional")
+            self.assertAlmostEqual(dist, b_dist)
+            if path:
+                self.assertEqual([src, dest], [b_path[0], b_path[-1]])
+                weight = sum(g.get_graph().get_edge(b_path[j], b_path[j + 1]).weight for j in range(len(b_path) - 1))
+                self.assertAlmostEqual(b_dist, weight)
+            else:
+                self.assertEqual([], b_path)
+        g_1 = graph_creator(5)
+        g_1.get_graph().add_edge(1, 2, 3)
+        g_1.get_graph().add_edge(1, 3, 0.5)
+        g_1.get_graph().add_edge(3, 2, 0.3)
+        self.assertEqual((0.8, [1, 3, 2]), g_1.shortest_path(1, 2, method="bidirectional"))
+        self.assertEqual((0, [1]), g_1.shortest_path(1, 1, method="bidirectional"))
+        self.assertEqual((float('inf'), []), g_1.shortest_path(2, 1, method="bidirectional"))
+        with self.assertRaises(ValueError):
+            g_1.shortest_path(1, 2, method="no_such_method")
+
+    def test_shortest_path_astar(self):
+        """
+        This test verify that A* finds paths of the same weight as Dijkstra's algorithm on a graph with
+        positions, and that it falls back to Dijkstra's algorithm when the nodes have no position
+        """
+        g = GraphAlgo()
+        self.assertTrue(g.load_from_json("../data/A5"))
+        self.assertGreater(g.astar_scale(), 0)
+        for src in range(0, 48, 3):
+            for dest in range(1, 48, 5):
+                dist, path = g.shortest_path(src, dest)
+                a_dist, a_path = g.shortest_path(src, dest, method="astar")
+                self.assertAlmostEqual(dist, a_dist)
+                self.assertEqual([src, dest], [a_path[0], a_path[-1]])
+        r = graph_creator_with_edges(100, 400)  # positions that do not follow the weights
+        for i in range(50):
+            src, dest = random.randint(1, 100), random.randint(1, 100)
+            self.assertAlmostEqual(r.shortest_path(src, dest)[0], r.shortest_path(src, dest, method="astar")[0])
+        no_pos = graph_creator(3)
+        no_pos.get_graph().add_edge(1, 2, 1)
+        no_pos.get_graph().add_edge(2, 3, 1)
+        self.assertEqual(0, no_pos.astar_scale())  # no admissible heuristic
+        self.assertEqual((2, [1, 2, 3]), no_pos.shortest_path(1, 3, method="astar"))
+
+    def test_shortest_path_alt(self):
+        """
+        This test verify that the landmark (ALT) search finds paths of the same weight as Dijkstra's algorithm,
+        that the landmark index can be saved and loaded and that it is not used once the graph changes
+        """
+        g = graph_creator_with_edges(200, 600)
+        index = g.preprocess_landmarks(4)
+        self.assertEqual(4, len(set(index.landmarks)))
+        for i in range(100):
+            src, dest = random.randint(1, 200), random.randint(1, 200)
+            self.assertAlmostEqual(g.shortest_path(src, dest)[0], g.shortest_path(src, dest, method="alt")[0])
+        file_name = "random_graph.landmarks"
+        self.assertTrue(g.save_landmarks(file_name))
+        e = GraphAlgo(g.get_graph())
+        self.assertTrue(e.load_landmarks(file_name))
+        self.assertEqual(index.landmarks, e.landmarks.landmarks)
+        self.assertEqual(index.forward, e.landmarks.forward)
+        g.get_graph().add_node(201)
+        g.get_graph().add_edge(1, 201, 0.01)
+        self.assertEqual((0.01, [1, 201]), e.shortest_path(1, 201, method="alt"))  # stale index is dropped
+        self.assertIsNone(e.landmarks)
+        self.assertFalse(e.load_landmarks(file_name))  # the index does not match the graph anymore
+        os.remove(file_name)
+        self.assertIsNone(GraphAlgo(DiGraph()).preprocess_landmarks())
+        a = GraphAlgo()  # two graphs of the same size that both end at the same mode count
+        self.assertTrue(a.load_from_json("../data/G_1000_8000_0.json"))
+        a.preprocess_landmarks(4)
+        self.assertTrue(a.save_landmarks(file_name))
+        self.assertTrue(a.load_from_json("../data/G_1000_8000_1.json"))
+        self.assertIsNone(a.landmarks)  # dropped with the old graph
+        self.assertFalse(a.load_landmarks(file_name))  # saved for the other graph
+        b = GraphAlgo()
+        self.assertTrue(b.load_from_json("../data/G_1000_8000_0.json"))
+        index = b.preprocess_landmarks(4)
+        self.assertEqual((a.get_graph().get_mc(), a.get_graph().v_size(), a.get_graph().e_size()),
+                         (b.get_graph().get_mc(), b.get_graph().v_size(), b.get_graph().e_size()))
+        self.assertFalse(index.is_valid_for(a.get_graph()))
+        a.landmarks = index  # an index of another graph object is not used
+        for i in range(50):
+            src, dest = random.randrange(1000), random.randrange(1000)
+            self.assertAlmostEqual(a.shortest_path(src, dest, method="bidirectional")[0],
+                                   a.shortest_path(src, dest, method="alt")[0])
+        self.assertTrue(b.load_from_json("../data/G_1000_8000_0.json"))  # the same content again
+        self.assertTrue(b.load_landmarks(file_name))
+        self.assertTrue(b.landmarks.is_valid_for(b.get_graph()))
+        os.remove(file_name)
+
+    def test_distance_matrix(self):
+        """
+        This test verify that every cell of the distance matrix agrees with shortest_path,
+        with and without worker processes
+        """
+        g = graph_creator_with_edges(150, 450)
+        sources = [random.randint(1, 150) for i in range(10)]
+        targets = [random.randint(1, 150) for i in range(15)] + [500]  # 500 is not in the graph
+        matrix = g.distance_matrix(sources, targets)
+        self.assertEqual((10, 16), matrix.shape)
+        for i, src in enumerate(sources):
+            for j, dest in enumerate(targets):
+                self.assertAlmostEqual(g.shortest_path(src, dest)[0], matrix[i][j])
+        self.assertTrue((matrix == g.distance_matrix(sources, targets, workers=2)).all())
+        self.assertEqual((0, 3), g.distance_matrix([], [1, 2, 3]).shape)
+
+    def test_shortest_paths_parallel(self):
+        """
+        This test verify that the parallel queries give the same answers as shortest_path in the input order,
+        also when the workers map the binary snapshot of the graph
+        """
+        g = graph_creator_with_edges(150, 450)
+        pairs = [(random.randint(1, 150), random.randint(1, 150)) for i in range(60)] + [(1, 500), (3, 3)]
+        expected = [g.shortest_path(src, dest) for src, dest in pairs]
+        for result in [g.shortest_paths_parallel(pairs, workers=1), g.shortest_paths_parallel(pairs, workers=2)]:
+            self.assertEqual(len(pairs), len(result))
+            for (d1, p1), (d2, p2) in zip(expected, result):
+                self.assertAlmostEqual(d1, d2)
+                self.assertEqual(p1[:1] + p1[-1:], p2[:1] + p2[-1:])
+        file_name = "random_graph.bin"
+        self.assertTrue(g.save_binary(file_name))
+        mapped = GraphAlgo()
+        self.assertTrue(mapped.load_binary(file_name, mapped=True))
+        self.assertEqual(g.shortest_paths_parallel(pairs, workers=1), mapped.shortest_paths_parallel(pairs, workers=2))
+        mapped.get_graph().close()
+        os.remove(file_name)
+        self.assertEqual([], g.shortest_paths_parallel([]))
+
+    def test_all_pairs_shortest_paths(self):
+        """
+        This test verify that both all pairs engines agree with shortest_path and that the result
+        can be saved and loaded
+        """
+        g = graph_creator_with_edges(80, 240)
+        fw = g.all_pairs_shortest_paths("floyd_warshall")
+        dij = g.all_pairs_shortest_paths("dijkstra")
+        self.assertIs(dij, g.all_pairs_shortest_paths())  # cached
+        for i in range(100):
+            src, dest = random.randint(1, 80), random.randint(1, 80)
+            d, p = g.shortest_path(src, dest)
+            for result in [fw, dij]:
+                rd, rp = result.path(src, dest)
+                self.assertAlmostEqual(d, rd)
+                self.assertEqual(p[:1] + p[-1:], rp[:1] + rp[-1:])
+                if rp:
+                    self.assertAlmostEqual(d, sum(g.get_graph().get_edge(u, v).weight for u, v in zip(rp, rp[1:])))
+        self.assertEqual((float('inf'), []), fw.path(1, 500))
+        self.assertEqual((0, [4]), dij.path(4, 4))
+        file_name = "random_graph.npz"
+        fw.save(file_name)
+        loaded = AllPairsPaths.load(file_name)
+        self.assertTrue(loaded.is_valid_for(g.get_graph()))
+        self.assertTrue((fw.dist == loaded.dist).all())
+        self.assertTrue((fw.next_hop == loaded.next_hop).all())
+        os.remove(file_name)
+        self.assertRaises(ValueError, g.all_pairs_shortest_paths, "bfs")
+        a, b = GraphAlgo(), GraphAlgo()  # the same size and mode count, not the same edges
+        self.assertTrue(a.load_from_json("../data/G_1000_8000_0.json"))
+        self.assertTrue(b.load_from_json("../data/G_1000_8000_1.json"))
+        a.all_pairs_shortest_paths("dijkstra").save(file_name)
+        loaded = AllPairsPaths.load(file_name)
+        self.assertTrue(loaded.is_valid_for(a.get_graph()))
+        self.assertFalse(loaded.is_valid_for(b.get_graph()))
+        self.assertTrue(b.load_from_json("../data/G_1000_8000_0.json"))  # the same content again
+        self.assertTrue(loaded.is_valid_for(b.get_graph()))
+        os.remove(file_name)
+
+    def test_scc_incremental(self):
+        """
+        This test verify that the strongly connected components stay correct while edges and nodes
+        are added and removed between the queries, without running trajan's algorithm again
+        """
+        g = graph_creator_with_edges(60, 90)
+        g.connected_components()
+        index = g.scc_index
+        graph = g.get_graph()
+        for i in range(150):
+            src, dest = random.randint(1, 62), random.randint(1, 62)
+            if random.random() < 0.6:
+                graph.add_edge(src, dest, 1)
+            elif random.random() < 0.9:
+                graph.remove_edge(*random.choice([(e.src, e.dest) for out in graph.Edges.values()
+                                                  for e in out.values()]))
+            elif graph.remove_node(src):
+                graph.add_node(src)
+                graph.add_node(61)  # a new node
+            expected = {frozenset(scc) for scc in GraphAlgo(graph).Trajans()}
+            self.assertEqual(expected, {frozenset(scc) for scc in g.connected_components()})
+            if dest in graph.get_all_v():
+                self.assertEqual(next(scc for scc in expected if dest in scc), set(g.connected_component(dest)))
+            else:
+                self.assertEqual([], g.connected_component(dest))
+            self.assertIs(index, g.scc_index)  # updated, not built again
+
+    def test_connected_component_targeted(self):
+        """
+        This test verify that the targeted search finds the same component as trajan's algorithm
+        without computing all the components, and that the component ids tell which nodes are strongly connected
+        """
+        g = graph_creator_with_edges(100, 150)
+        targeted = [set(g.connected_component(key, targeted=True)) for key in range(1, 101)]
+        self.assertIsNone(g.scc_index)  # trajan's algorithm did not run
+        for key in range(1, 101):
+            self.assertEqual(set(g.connected_component(key)), targeted[key - 1])
+        index = g.scc_index
+        for key in range(1, 101):
+            for other in g.connected_component(key):
+                self.assertEqual(index.component_id(key), index.component_id(other))
+        self.assertEqual(len(g.connected_components()), len({index.component_id(key) for key in range(1, 101)}))
+        self.assertEqual([], g.connected_component(500, targeted=True))
+
+    def test_connected_components_methods(self):
+        """
+        This test verify that the Kosaraju, path-based and scipy engines find the same components as trajan's algorithm
+        """
+        for g in [graph_creator_with_edges(200, 300), graph_creator_with_edges(200, 800), GraphAlgo()]:
+            if g.get_graph() is None:
+                self.assertTrue(g.load_from_json("../data/A5"))
+            tarjan = g.connected_components()
+            self.assertEqual(tarjan, g.connected_components(method="path"))  # the same order too
+            for method in ["kosaraju", "scipy"]:
+                comps = g.connected_components(method=method)
+                self.assertEqual({frozenset(scc) for scc in tarjan}, {frozenset(scc) for scc in comps})
+                self.assertEqual(sum(len(scc) for scc in tarjan), sum(len(scc) for scc in comps))
+        with self.assertRaises(ValueError):
+            g.connected_components(method="bfs")
+        named = DiGraph()  # keys that are not ints
+        named.add_nodes_from(["a", "b", "c", "d"])
+        named.add_edges_from([("a", "b", 1), ("b", "a", 1), ("b", "c", 1)])
+        g = GraphAlgo(named)
+        for method in ["tarjan", "kosaraju", "path", "scipy"]:
+            comps = g.connected_components(method=method)
+            self.assertEqual({frozenset("ab"), frozenset("c"), frozenset("d")}, {frozenset(scc) for scc in comps})
+
+    def test_condensation_and_reachable(self):
+        """
+        This test verify that the condensation is a DAG of the components and that reachable
+        agrees with a search over the graph, also after the graph was changed
+        """
+        g = graph_creator_with_edges(80, 120)
+        dag = g.condensation()
+        self.assertEqual(len(g.connected_components()), dag.v_size())
+        self.assertEqual(len(dag.get_all_v()), len(GraphAlgo(dag).connected_components()))  # no cycles
+        for i in range(3):
+            for src in range(1, 81, 3):
+                reached = set(g.shortest_path_tree(src).dist)
+                for dest in range(1, 81):
+                    self.assertEqual(dest in reached, g.reachable(src, dest))
+            g.get_graph().add_edge(random.randint(1, 80), random.randint(1, 80), 1)
+        self.assertFalse(g.reachable(1, 500))
+        self.assertTrue(g.reachable(7, 7))
+        path = graph_creator(3)
+        path.get_graph().add_edge(1, 2, 5)
+        path.get_graph().add_edge(2, 1, 1)
+        path.get_graph().add_edge(2, 3, 4)
+        path.get_graph().add_edge(1, 3, 2)
+        self.assertTrue(path.reachable(1, 3))
+        self.assertFalse(path.reachable(3, 2))
+        dag = path.condensation()
+        self.assertEqual(2, dag.v_size())
+        self.assertEqual([2], [e.weight for out in dag.Edges.values() for e in out.values()])  # the lowest weight
+        edgeless = graph_creator(20000)
+        self.assertFalse(edgeless.reachable(1, 20000))
+        labels = edgeless._condensation().labels.values()
+        self.assertEqual(20000, sum(label.bit_length() for label in labels))  # one bit per sink, not one per rank
+        chain = graph_creator(1000)
+        chain.get_graph().add_edges_from((v, v + 1, 1) for v in range(1, 1000))
+        self.assertTrue(chain.reachable(1, 1000))
+        self.assertFalse(chain.reachable(1000, 1))
+        self.assertEqual(1000 * 1001 // 2, sum(label.bit_length() for label in chain._condensation().labels.values()))
+
+    def test_results_cache(self):
+        """
+        This test verify that repeated queries on an unchanged graph are served from the cache
+        and that any change in the graph (mode count) drops the cached results
+        """
+        g = graph_creator(4)
+        g.get_graph().add_edge(1, 2, 1)
+        g.get_graph().add_edge(2, 3, 1)
+        g.get_graph().add_edge(3, 1, 1)
+        self.assertEqual((2, [1, 2, 3]), g.shortest_path(1, 3))
+        self.assertEqual(0, g.cache_info()["hits"])
+        self.assertEqual((1, [1, 2]), g.shortest_path(1, 2))  # 2 was settled before 3, served from the cache
+        self.assertEqual(1, g.cache_info()["hits"])
+        self.assertEqual([3, 2, 1], g.connected_component(1))
+        self.assertEqual([[3, 2, 1], [4]], g.connected_components())
+        hits = g.cache_info()["hits"]
+        self.assertEqual([3, 2, 1], g.connected_component(2))
+        self.assertEqual(hits + 1, g.cache_info()["hits"])
+        g.connected_components()[0].clear()  # the returned lists are copies
+        self.assertEqual([[3, 2, 1], [4]], g.connected_components())
+        g.get_graph().add_edge(1, 3, 0.5)  # the graph has changed - the cache must be dropped
+        self.assertEqual((0.5, [1, 3]), g.shortest_path(1, 3))
+        g.get_graph().add_edge(3, 4, 1)
+        g.get_graph().add_edge(4, 1, 1)
+        self.assertEqual([4, 3, 2, 1], sorted(g.connected_component(4), reverse=True))
+        small = GraphAlgo(graph_creator(10).get_graph(), cache_size=2)  # LRU eviction
+        for src in range(1, 6):
+            small.shortest_path_tree(src)
+        self.assertEqual(2, small.cache_info()["size"])
+
     def test_save_and_load(self):
         """
         This test 1) compare if the graph that saved is equal to the other graph that load from him
@@ -105,10 +548,96 @@ class MyTestCase(unittest.TestCase):
         empty_graph = GraphAlgo()
         self.assertTrue(empty_graph.save_to_json("empty_graph"))  # save and load empty graph
         self.assertTrue(empty_graph.load_from_json("empty_graph"))
+        with open(file_name, "r") as file:  # the algorithms state is not saved with the nodes
+            saved = json.load(file)
+        self.assertEqual({"key", "info", "tag", "pos"}, set(saved["Nodes"][0]))
+        self.assertEqual({"src", "dest", "weight", "info", "tag"}, set(saved["Edges"][0]))
         large_graph = graph_creator_with_edges(100000, 10000)
         self.assertTrue(large_graph.save_to_json("large graph"))  # save and load large graph
         self.assertTrue(large_graph.load_from_json("large graph"))
 
+    def test_save_and_load_binary(self):
+        """
+        This test verify that a binary snapshot loads back the same graph (as a DiGraph or read only)
+        and that damaged snapshots are rejected
+        """
+        file_name = "random_graph.bin"
+        g = graph_creator_with_edges(50, 200)
+        g.get_graph().add_node(51)  # node without position
+        self.assertTrue(g.save_binary(file_name))
+        e = GraphAlgo()
+        self.assertTrue(e.load_binary(file_name))
+        self.assertIsInstance(e.get_graph(), DiGraph)
+        self.assertEqual(g.get_graph().e_size(), e.get_graph().e_size())
+        for key, node in g.get_graph().get_all_v().items():
+            self.assertEqual(node.pos, e.get_graph().get_node(key).pos)
+            self.assertEqual(g.get_graph().Edges[key].keys(), e.get_graph().Edges[key].keys())
+        self.assertTrue(e.get_graph().add_edge(51, 1, 1))  # the loaded DiGraph can be changed
+        self.assertTrue(e.load_binary(file_name, read_only=True))
+        self.assertEqual(g.connected_components(), e.connected_components())
+        self.assertEqual(g.shortest_path(1, 7), e.shortest_path(1, 7))
+        self.assertEqual(g.get_graph().get_mc(), e.get_graph().get_mc())
+        with open(file_name, "r+b") as file:  # flip one byte of the payload
+            file.seek(-3, os.SEEK_END)
+            b = file.read(1)
+            file.seek(-3, os.SEEK_END)
+            file.write(bytes([b[0] ^ 0xFF]))
+        self.assertFalse(e.load_binary(file_name))  # bad checksum
+        self.assertEqual(0, e.get_graph().v_size())
+        self.assertFalse(e.load_binary("../data/A5"))  # not a snapshot
+        empty_graph = GraphAlgo()
+        self.assertTrue(empty_graph.save_binary(file_name))
+        self.assertTrue(e.load_binary(file_name))
+        self.assertEqual(0, e.get_graph().v_size())
+        os.remove(file_name)
+        named = DiGraph()  # keys that do not fit the int64 arrays of a snapshot
+        named.add_nodes_from(["a", "b"])
+        named.add_edge("a", "b", 1)
+        g = GraphAlgo(named)
+        self.assertFalse(g.save_binary(file_name))
+        self.assertFalse(os.path.exists(file_name))
+        g.preprocess_landmarks(1)
+        self.assertFalse(g.save_landmarks("named.landmarks"))  # no fingerprint
+        for query in [lambda: g.distance_matrix(["a"], ["b"]), lambda: g.shortest_paths_parallel([("a", "b")]),
+                      g.all_pairs_shortest_paths]:
+            self.assertRaises(ValueError, query)
+        self.assertEqual((1, ["a", "b"]), g.shortest_path("a", "b"))
+
+    def test_load_streaming(self):
+        """
+        This test verify that the streaming json reader gives the same nodes and edges as json.load
+        for both file formats, also when the items are cut between the read chunks
+        """
+        for file_name in ["../data/A5", "../data/G_100_800_0.json", "../data/T0.json", "empty_graph"]:
+            with open(file_name, "r") as file:
+                expected = json.load(file) or {}
+            for chunk_size in [5, 64, 1 << 16]:
+                items = {}
+                with open(file_name, "r") as file:
+                    for section, item in JsonStream(file, chunk_size).items(("Nodes", "Edges")):
+                        items.setdefault(section, []).append(item)
+                self.assertEqual(expected.get("Nodes", []), items.get("Nodes", []))
+                self.assertEqual(expected.get("Edges", []), items.get("Edges", []))
+        g = GraphAlgo()
+        self.assertTrue(g.load_from_json("../data/A5"))  # Edges before Nodes, "pos" as string
+        self.assertEqual((48, 166), (g.get_graph().v_size(), g.get_graph().e_size()))
+        self.assertEqual((35.212217299435025, 32.106235628571426, 0.0), g.get_graph().get_node(0).pos)
+        no_pos = graph_creator(3)  # nodes without position are saved with "pos": null
+        no_pos.get_graph().add_edge(1, 2, 1)
+        self.assertTrue(no_pos.save_to_json("no_pos_graph"))
+        self.assertTrue(g.load_from_json("no_pos_graph"))
+        self.assertIsNone(g.get_graph().get_node(1).pos)
+        self.assertTrue(g.get_graph().has_edge(1, 2))
+        os.remove("no_pos_graph")
+        with open("str_id_graph", "w") as file:  # keys that do not fit the int arrays
+            json.dump({"Nodes": [{"id": 0}, {"id": "a"}, {"id": "b"}],
+                       "Edges": [{"src": 0, "w": 1.5, "dest": "a"}, {"src": "a", "w": 2, "dest": "b"}]}, file)
+        self.assertTrue(g.load_from_json("str_id_graph"))
+        self.assertEqual((3, 2), (g.get_graph().v_size(), g.get_graph().e_size()))
+        self.assertEqual((3.5, [0, "a", "b"]), g.shortest_path(0, "b"))
+        os.remove("str_id_graph")
+        self.assertFalse(g.load_from_json("no_such_file"))
+
     def test_SCC_algo(self):
         """
         this test will verify the functionality of connected_component/connected_components
@@ -238,6 +238,43 @@ def compares_run_time_sp_json(src: int, dest: int, file_name: str) -> list:
     return results
 
 
+def compares_run_time_scc_methods(graph_algo: GraphAlgo) -> list:
+    """
+    Compares the running time of the SCC engines of GraphAlgo (tarjan, kosaraju, path-based) on the same graph,
+    every engine starts without cached results
+    :param graph_algo: GraphAlgo with the graph
+    :return: list of the results of each engine, every component sorted and the components sorted
+    """
+    results = []
+    for method in ["tarjan", "kosaraju", "path"]:
+        graph_algo.cache.clear()  # no cached components
+        graph_algo.scc_index = None
+        start_time = datetime.now()
+        comps = graph_algo.connected_components(method=method)
+        end_time = datetime.now()
+        print(f"run time of {method} :", end_time - start_time)
+        results.append(sorted(sorted(scc) for scc in comps))
+    return results
+
+
+def compares_run_time_dijkstra_queues(graph_algo: GraphAlgo, src: int) -> list:
+    """
+    Compares the running time of Dijkstra's algorithm over the whole graph with the priority queues
+    of GraphAlgo.dijkstras (heapq with stale entries, IndexedHeap with decrease-key, Dial's buckets)
+    :param graph_algo: GraphAlgo with the graph
+    :param src: the source node
+    :return: list of the distances found with each queue
+    """
+    results = []
+    for queue in ["heapq", "indexed", "buckets"]:
+        start_time = datetime.now()
+        dist, parent = graph_algo.dijkstras(graph_algo.get_graph().get_node(src), queue=queue)
+        end_time = datetime.now()
+        print(f"run time of {queue} :", end_time - start_time)
+        results.append(dist)
+    return results
+
+
 def graph_generator(v_size: int, e_size: int) -> list:
     """
     generate graph with v_size vertices and e_size edges randomly
@@ -249,23 +286,21 @@ def graph_generator(v_size: int, e_size: int) -> list:
     my_graph = DiGraph()
     g = nx.Graph()
     nx_graph = g.to_directed()
-    v, e = 1, 1
-    while v <= v_size:
+    nodes = []
+    for v in range(1, v_size + 1):
         x = random.uniform(0.1, 35)
         y = random.uniform(0.1, 35)
-        position = (x, y, 0)
-        my_graph.add_node(v, pos=position)
-        nx_graph.add_node(v, pos=position)
-        v += 1
-    while e <= e_size:
+        nodes.append((v, (x, y, 0)))
+    edges = {}
+    while len(edges) < e_size:
         r_src = random.randint(1, v_size)
         r_dest = random.randint(1, v_size)
-        r_weight = random.uniform(0.1, 200.1)
-        if not my_graph.has_edge(r_src, r_dest):
-            my_graph.add_edge(r_src, r_dest, r_weight)
-            nx_graph.add_edge(r_src, r_dest, weight=r_weight)
-            e += 1
-
+        if r_src != r_dest and (r_src, r_dest) not in edges:
+            edges[(r_src, r_dest)] = random.uniform(0.1, 200.1)
+    my_graph.add_nodes_from(nodes)  # one batch for the nodes and one for the edges
+    my_graph.add_edges_from((src, dest, w) for (src, dest), w in edges.items())
+    nx_graph.add_nodes_from((v, {"pos": position}) for v, position in nodes)
+    nx_graph.add_weighted_edges_from((src, dest, w) for (src, dest), w in edges.items())
     graph_algo = GraphAlgo(my_graph)
     return [graph_algo, nx_graph]
 
@@ -458,6 +493,63 @@ class MyTestCase(unittest.TestCase):
         results = compares_run_time_cc_json(file_name)
         self.assertEqual(results[0], results[1])  # compare to networkx
 
+    def test_comparison_scc_methods(self):
+        """
+        In this test we will compare the run time of the three SCC engines of GraphAlgo
+        (connected_components(method=...)) and check that they find the same components
+        this test checks the above on the A0-A5 files and on generated graphs:
+        graph A: 10k vertices 10k edges, B: 10k v, 100k e, C: 100k v, 1m e
+        """
+        print("connected_components methods:\n")
+        for name in ["A0", "A1", "A2", "A3", "A4", "A5"]:
+            print(f"\nGraph {name}:\n")
+            graph_algo = GraphAlgo()
+            self.assertTrue(graph_algo.load_from_json("../data/" + name))
+            results = compares_run_time_scc_methods(graph_algo)
+            self.assertEqual(results[0], results[1])
+            self.assertEqual(results[0], results[2])
+        for graph, (v_size, e_size) in zip("ABC", [(10000, 10000), (10000, 100000), (100000, 1000000)]):
+            print(f"\nGraph {graph}:\n")
+            results = compares_run_time_scc_methods(graph_generator(v_size, e_size)[0])
+            self.assertEqual(results[0], results[1])
+            self.assertEqual(results[0], results[2])
+
+    def test_comparison_dijkstra_queues(self):
+        """
+        In this test we will compare the run time of Dijkstra's algorithm with the heapq queue and with
+        the indexed heap and with Dial's buckets (dijkstras(queue=...)) and check that they find the same distances
+        graph C: 10k vertices 100k edges, D: 100k v, 1m e
+        """
+        print("dijkstras queues:\n")
+        for graph, (v_size, e_size) in zip("CD", [(10000, 100000), (100000, 1000000)]):
+            print(f"\nGraph {graph}:\n")
+            results = compares_run_time_dijkstra_queues(graph_generator(v_size, e_size)[0], 1)
+            self.assertEqual(results[0], results[1])
+            self.assertEqual(results[0].keys(), results[2].keys())
+            for key, dist in results[0].items():
+                self.assertAlmostEqual(dist, results[2][key])
+
+    def test_comparison_dijkstra_queues_chain(self):
+        """
+        In this test we will compare the run time of the heapq queue and of Dial's buckets on a long path
+        of alternating 1 and 4000 weights, where almost every bucket on the way is empty
+        (the empty buckets must not be scanned - the buckets should stay within a few times heapq)
+        """
+        n = 20000
+        chain = DiGraph()
+        chain.add_nodes_from(range(n))
+        chain.add_edges_from((v, v + 1, 1 if v % 2 else 4000) for v in range(n - 1))
+        graph_algo = GraphAlgo(chain)
+        run_times = []
+        for queue in ["heapq", "buckets"]:
+            start_time = datetime.now()
+            dist = graph_algo.dijkstras(chain.get_node(0), chain.get_node(n - 1), queue=queue)[0]
+            end_time = datetime.now()
+            print(f"run time of {queue} :", end_time - start_time)
+            run_times.append((end_time - start_time).total_seconds())
+            self.assertEqual(n // 2 * 4001 - 1, dist[n - 1])
+        self.assertLess(run_times[1], 10 * run_times[0] + 0.1)
+
     def test_comparison_connected_component(self):
         """
         In this test we will compare the performance of the networkx library
@@ -0,0 +1,17 @@
+import random
+from src.DiGraph import DiGraph
+
+
+def random_digraph(v_size: int, e_size: int) -> DiGraph:
+    """
+    generate graph with v_size vertices and e_size edges randomly, shared by the test modules
+    :param v_size: number of vertices (keys 0..v_size-1, random positions)
+    :param e_size: number of edges
+    :return: DiGraph with the given number of edges and vertices
+    """
+    g = DiGraph()
+    for v in range(v_size):
+        g.add_node(v, pos=(random.uniform(0.1, 35), random.uniform(0.1, 35), 0))
+    while g.e_size() < e_size:
+        g.add_edge(random.randrange(v_size), random.randrange(v_size), random.uniform(0.1, 20))
+    return g
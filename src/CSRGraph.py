@@ -0,0 +1,490 @@
+import math
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+
+from src.DiGraph import DiGraph
+from src.edge_data import EdgeData
+from src.graph_json import read_graph_json
+from src.GraphInterface import GraphInterface
+from src.node_data import NodeData
+
+# binary snapshot: header (magic, version, n, m, mc, crc32 of the payload) followed by the payload
+# keys q[n], pos d[3n], out_offsets q[n+1], out_targets q[m], out_weights d[m],
+# in_offsets q[n+1], in_sources q[m], in_weights d[m] - little endian, every item is 8 bytes
+SNAPSHOT_MAGIC = b"DWGB"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_HEADER = struct.Struct("<4sIQQQII")
+
+
+class KeyRange:
+    """
+    the node key -> vertex index mapping of a graph whose keys are 0..n-1 - every key is its own index,
+    unlike range a key outside 0..n-1 (a negative one too) raises KeyError like a missing dictionary key
+    """
+    __slots__ = ("n",)
+
+    def __init__(self, n: int):
+        self.n = n
+
+    def __getitem__(self, key) -> int:
+        if key in self:
+            return int(key)
+        raise KeyError(key)
+
+    def __contains__(self, key) -> bool:
+        try:
+            return 0 <= key < self.n and key == int(key)
+        except (TypeError, ValueError):  # not a number
+            return False
+
+    def __iter__(self):
+        return iter(range(self.n))
+
+    def __len__(self):
+        return self.n
+
+    def __repr__(self):
+        return f"KeyRange[{self.n}]"
+
+
+class CSRGraph(GraphInterface):
+    """
+    This class represent a read only directed weighted graph stored in compressed sparse row format.
+    each vertex gets an index 0..n-1 (in insertion order), the out edges of vertex i are
+    out_targets[out_offsets[i]:out_offsets[i + 1]] with the matching weights in out_weights,
+    the in edges are kept the same way in in_offsets/in_sources/in_weights.
+    all the arrays are flat array.array objects so a graph costs a few dozens of bytes per edge,
+    the graph can not be changed - add/remove methods always return false
+    """
+
+    def __init__(self, keys, pos, out_offsets, out_targets, out_weights, in_offsets, in_sources, in_weights,
+                 mc: int = 0):
+        """
+        :param keys: the key of each vertex by its index
+        :param pos: flat x,y,z positions by index (nan for a vertex without a position)
+        :param out_offsets: n+1 offsets into out_targets/out_weights
+        :param out_targets: index of the destination of each out edge
+        :param out_weights: weight of each out edge
+        :param in_offsets: n+1 offsets into in_sources/in_weights
+        :param in_sources: index of the source of each in edge
+        :param in_weights: weight of each in edge
+        :param mc: the mode count of the graph this snapshot was taken from
+        """
+        self.keys = keys
+        self.pos = pos
+        self.out_offsets = out_offsets
+        self.out_targets = out_targets
+        self.out_weights = out_weights
+        self.in_offsets = in_offsets
+        self.in_sources = in_sources
+        self.in_weights = in_weights
+        self.MC = mc
+        self.index = self._make_index(keys)  # node key -> vertex index
+        self._nodes = None  # NodeData objects, created only if someone asks for them
+        self._mmap = None  # the mapped snapshot file of a graph opened with open_mapped
+        self.file_name = None  # the path of that file
+
+    @staticmethod
+    def _make_index(keys):
+        """
+        :return: mapping of node key -> vertex index, KeyRange(n) when the keys are 0..n-1 (no dictionary needed)
+        """
+        if all(key == i for i, key in enumerate(keys)):
+            return KeyRange(len(keys))
+        return {key: i for i, key in enumerate(keys)}
+
+    # --------------------------- builders ------------------------ #
+    @classmethod
+    def from_digraph(cls, graph: DiGraph) -> 'CSRGraph':
+        """
+        take a read only snapshot of a DiGraph
+        :param graph: the graph to copy
+        :return: CSRGraph with the same vertices (same order) and edges
+        """
+        nodes = [(key, node.pos) for key, node in graph.get_all_v().items()]
+        edges = ((e.src, e.dest, e.weight) for out in graph.Edges.values() for e in out.values())
+        return cls.from_edges(nodes, edges, graph.get_mc(), checked=True)
+
+    @classmethod
+    def from_json(cls, file_name: str) -> 'CSRGraph':
+        """
+        build the graph straight from a json file (both formats of GraphAlgo.load_from_json),
+        without creating a DiGraph first
+        :param file_name: the path of the json
+        :return: CSRGraph of the file
+        """
+        nodes, edges = read_graph_json(file_name)
+        return cls.from_edges(nodes, edges)
+
+    @classmethod
+    def from_edges(cls, nodes, edges, mc: int = 0, checked: bool = False) -> 'CSRGraph':
+        """
+        build the CSR arrays with a counting sort of the edges by source (and by destination)
+        :param nodes: iterable of (key, pos), pos is a 3D tuple or None
+        :param edges: iterable of (src key, dest key, weight)
+        :param mc: the mode count to report
+        :param checked: true if the edges are known to be valid, else the same edges DiGraph.add_edge
+                        rejects (unknown vertices, self loops, negative weights, duplicates) are skipped
+        :return: CSRGraph
+        """
+        keys = array('q')
+        pos = array('d')
+        index = {}
+        for key, p in nodes:
+            if key in index:
+                continue
+            index[key] = len(keys)
+            keys.append(key)
+            pos.extend(p if p is not None else (math.nan, math.nan, math.nan))
+        n = len(keys)
+        srcs, dests, weights = array('q'), array('q'), array('d')
+        seen = set()
+        for s, d, w in edges:
+            if not checked:
+                if s not in index or d not in index or s == d or w < 0 or (s, d) in seen:
+                    continue
+                seen.add((s, d))
+            srcs.append(index[s])
+            dests.append(index[d])
+            weights.append(w)
+        out_offsets, out_targets, out_weights = cls._counting_sort(n, srcs, dests, weights)
+        in_offsets, in_sources, in_weights = cls._counting_sort(n, dests, srcs, weights)
+        return cls(keys, pos, out_offsets, out_targets, out_weights, in_offsets, in_sources, in_weights, mc)
+
+    @staticmethod
+    def _counting_sort(n: int, rows: array, cols: array, weights: array) -> (array, array, array):
+        """
+        group the edges by their row vertex, the order of the edges of each row is kept
+        :return: offsets (n+1), cols and weights ordered by row
+        """
+        offsets = array('q', bytes(8 * (n + 1)))
+        for r in rows:
+            offsets[r + 1] += 1
+        for i in range(n):
+            offsets[i + 1] += offsets[i]
+        fill = offsets[:-1]  # next free slot of each row
+        m = len(rows)
+        sorted_cols = array('q', bytes(8 * m))
+        sorted_weights = array('d', bytes(8 * m))
+        for e in range(m):
+            r = rows[e]
+            slot = fill[r]
+            sorted_cols[slot] = cols[e]
+            sorted_weights[slot] = weights[e]
+            fill[r] = slot + 1
+        return offsets, sorted_cols, sorted_weights
+
+    def to_digraph(self) -> DiGraph:
+        """
+        :return: a new (changeable) DiGraph with the vertices and edges of this graph
+        """
+        g = DiGraph()
+        keys, targets, weights = self.keys, self.out_targets, self.out_weights
+        g.add_nodes_from((keys[i], self.get_pos(i)) for i in range(len(keys)))
+        g.add_edges_from((keys[i], keys[targets[e]], weights[e])
+                         for i in range(len(keys)) for e in range(self.out_offsets[i], self.out_offsets[i + 1]))
+        return g
+
+    # --------------------------- binary snapshot ------------------------ #
+    def _sections(self) -> list:
+        """
+        :return: the arrays of the graph in the order they are written in a snapshot
+        """
+        return [self.keys, self.pos, self.out_offsets, self.out_targets, self.out_weights,
+                self.in_offsets, self.in_sources, self.in_weights]
+
+    @staticmethod
+    def _section_layout(n: int, m: int) -> list:
+        """
+        :return: (typecode, number of items) of each snapshot section
+        """
+        return [('q', n), ('d', 3 * n), ('q', n + 1), ('q', m), ('d', m), ('q', n + 1), ('q', m), ('d', m)]
+
+    def _payload(self) -> list:
+        """
+        :return: the bytes of each snapshot section (little endian)
+        """
+        payload = []
+        for section, (code, size) in zip(self._sections(), self._section_layout(len(self.keys), len(self.out_targets))):
+            section = array(code, section)
+            if sys.byteorder == "big":
+                section.byteswap()
+            payload.append(section.tobytes())
+        return payload
+
+    def fingerprint(self) -> int:
+        """
+        the crc32 of the snapshot payload (the checksum save writes in the header) - it depends only on the
+        vertices, positions and edges and not on the mode count, so an index saved next to a graph file can tell
+        whether it was built on the graph it is loaded with
+        :return: the fingerprint of the content of the graph
+        """
+        crc = 0
+        for chunk in self._payload():
+            crc = zlib.crc32(chunk, crc)
+        return crc
+
+    @classmethod
+    def fingerprint_of(cls, graph: GraphInterface) -> int:
+        """
+        :param graph: CSRGraph or DiGraph
+        :return: the fingerprint of the graph (a DiGraph is turned into a CSRGraph first)
+        """
+        return (graph if isinstance(graph, cls) else cls.from_digraph(graph)).fingerprint()
+
+    def save(self, file_name: str) -> None:
+        """
+        write the graph into a binary snapshot file, the arrays are written as they are (no per element work)
+        :param file_name: the path of the file
+        """
+        payload = self._payload()
+        crc = 0
+        for chunk in payload:
+            crc = zlib.crc32(chunk, crc)
+        with open(file_name, "wb") as file:
+            file.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(self.keys), len(self.out_targets),
+                                            self.MC, crc, 0))
+            for chunk in payload:
+                file.write(chunk)
+
+    @staticmethod
+    def read_header(buffer) -> (int, int, int, int):
+        """
+        check the header of a snapshot
+        :param buffer: the snapshot bytes (at least the header)
+        :return: (n, m, mc, crc32 of the payload)
+        """
+        if len(buffer) < SNAPSHOT_HEADER.size:
+            raise ValueError("not a graph snapshot: the file is too short")
+        magic, version, n, m, mc, crc, _ = SNAPSHOT_HEADER.unpack_from(buffer)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError("not a graph snapshot: bad magic")
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"unsupported graph snapshot version {version}")
+        if len(buffer) != SNAPSHOT_HEADER.size + 8 * (6 * n + 4 * m + 2):
+            raise ValueError("the graph snapshot is truncated")
+        return n, m, mc, crc
+
+    @classmethod
+    def load(cls, file_name: str) -> 'CSRGraph':
+        """
+        read a binary snapshot written by save, the arrays are copied straight from the file bytes
+        :param file_name: the path of the file
+        :return: CSRGraph of the snapshot
+        """
+        with open(file_name, "rb") as file:
+            data = file.read()
+        n, m, mc, crc = cls.read_header(data)
+        view = memoryview(data)[SNAPSHOT_HEADER.size:]
+        if zlib.crc32(view) != crc:
+            raise ValueError("the graph snapshot is corrupted (bad checksum)")
+        sections = []
+        offset = 0
+        for code, size in cls._section_layout(n, m):
+            section = array(code)
+            section.frombytes(view[offset:offset + 8 * size])
+            if sys.byteorder == "big":
+                section.byteswap()
+            sections.append(section)
+            offset += 8 * size
+        return cls(*sections, mc=mc)
+
+    @classmethod
+    def open_mapped(cls, file_name: str, verify: bool = True) -> 'CSRGraph':
+        """
+        open a binary snapshot without reading it - the file is memory mapped read only and every
+        array of the graph is a memoryview straight over the mapped pages (zero copy), so many
+        processes that open the same snapshot share one copy of it in the page cache
+        :param file_name: the path of the file
+        :param verify: check the crc32 of the payload (reads the whole file once)
+        :return: CSRGraph over the mapped file, call close() to unmap it
+        """
+        if sys.byteorder == "big":  # the snapshot is little endian, it can not be used in place
+            return cls.load(file_name)
+        with open(file_name, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            n, m, mc, crc = cls.read_header(mapped)
+            view = memoryview(mapped)[SNAPSHOT_HEADER.size:]
+            if verify and zlib.crc32(view) != crc:
+                raise ValueError("the graph snapshot is corrupted (bad checksum)")
+            sections = []
+            offset = 0
+            for code, size in cls._section_layout(n, m):
+                sections.append(view[offset:offset + 8 * size].cast(code))
+                offset += 8 * size
+        except ValueError:
+            mapped.close()
+            raise
+        graph = cls(*sections, mc=mc)
+        graph._mmap = mapped
+        graph.file_name = file_name
+        return graph
+
+    def close(self) -> None:
+        """
+        unmap the snapshot file of a graph opened with open_mapped, the graph can not be used after that
+        """
+        if self._mmap is None:
+            return
+        for section in self._sections():
+            if isinstance(section, memoryview):
+                section.release()
+        self._mmap.close()
+        self._mmap = None
+        self.file_name = None
+
+    def __getstate__(self) -> dict:
+        """
+        pickle support (for example to hand the graph to worker processes), the arrays of a mapped
+        graph are copied since the mapped file itself can not be pickled
+        """
+        state = self.__dict__.copy()
+        for name, section in zip(("keys", "pos", "out_offsets", "out_targets", "out_weights",
+                                  "in_offsets", "in_sources", "in_weights"), self._sections()):
+            if isinstance(section, memoryview):
+                state[name] = array(section.format, section.tobytes())
+        state["_nodes"] = None
+        state["_mmap"] = None
+        state["file_name"] = None
+        return state
+
+    # --------------------------- GraphInterface ------------------------ #
+    def v_size(self) -> int:
+        """
+        :return: number of vertices
+        """
+        return len(self.keys)
+
+    def e_size(self) -> int:
+        """
+        :return: the number of edges
+        """
+        return len(self.out_targets)
+
+    def get_mc(self) -> int:
+        """
+        the graph can not be changed so the mode count is the one of the graph it was built from
+        :return: mode count
+        """
+        return self.MC
+
+    def get_all_v(self) -> dict:
+        """
+        :return: dictionary of all the nodes in the Graph (node key -> NodeData)
+        """
+        if self._nodes is None:
+            self._nodes = {self.keys[i]: NodeData(self.keys[i], pos=self.get_pos(i)) for i in range(len(self.keys))}
+        return self._nodes
+
+    def all_in_edges_of_node(self, id1: int) -> dict:
+        """
+        :param id1: the id of the node
+        :return: dictionary of all the nodes connected to (into) node_id
+        """
+        i = self.index[id1]
+        nodes = self.get_all_v()
+        keys = self.keys
+        return {keys[s]: nodes[keys[s]] for s in self.in_sources[self.in_offsets[i]:self.in_offsets[i + 1]]}
+
+    def all_out_edges_of_node(self, id1: int) -> dict:
+        """
+        :param id1: the id of the node
+        :return: dictionary of all the nodes connected from node_id
+        """
+        i = self.index[id1]
+        nodes = self.get_all_v()
+        keys = self.keys
+        return {keys[d]: nodes[keys[d]] for d in self.out_targets[self.out_offsets[i]:self.out_offsets[i + 1]]}
+
+    def out_arcs(self, id1: int):
+        """
+        :param id1: the id of the node
+        :return: iterator of (dest node id, weight) of the edges going out of id1
+        """
+        i = self.index[id1]
+        keys, start, end = self.keys, self.out_offsets[i], self.out_offsets[i + 1]
+        return ((keys[d], w) for d, w in zip(self.out_targets[start:end], self.out_weights[start:end]))
+
+    def in_arcs(self, id1: int):
+        """
+        :param id1: the id of the node
+        :return: iterator of (src node id, weight) of the edges coming into id1
+        """
+        i = self.index[id1]
+        keys, start, end = self.keys, self.in_offsets[i], self.in_offsets[i + 1]
+        return ((keys[s], w) for s, w in zip(self.in_sources[start:end], self.in_weights[start:end]))
+
+    def add_edge(self, id1: int, id2: int, weight: float) -> bool:
+        return False  # read only graph
+
+    def add_node(self, node_id: int, pos: tuple = None) -> bool:
+        return False  # read only graph
+
+    def remove_node(self, node_id: int) -> bool:
+        return False  # read only graph
+
+    def remove_edge(self, node_id1: int, node_id2: int) -> bool:
+        return False  # read only graph
+
+    # --------------------------- queries ------------------------ #
+    def get_pos(self, i: int) -> tuple or None:
+        """
+        :param i: vertex index
+        :return: the position of the vertex, None if it has no position
+        """
+        x = self.pos[3 * i]
+        if x != x:  # nan - no position
+            return None
+        return x, self.pos[3 * i + 1], self.pos[3 * i + 2]
+
+    def _edge_slot(self, i: int, j: int) -> int:
+        """
+        :return: the position of the edge (i,j) in out_targets, -1 if there is no such edge
+        """
+        for e in range(self.out_offsets[i], self.out_offsets[i + 1]):
+            if self.out_targets[e] == j:
+                return e
+        return -1
+
+    def has_edge(self, node_id1: int, node_id2: int) -> bool:
+        """
+        :return: true if there is edge (node_id1,node_id2) else return false
+        """
+        if node_id1 not in self.index or node_id2 not in self.index:
+            return False
+        return self._edge_slot(self.index[node_id1], self.index[node_id2]) != -1
+
+    def get_edge(self, node_id1: int, node_id2: int) -> EdgeData or None:
+        """
+        :return: the EdgeData of (node_id1,node_id2) if there is no edge return None
+        """
+        if node_id1 not in self.index or node_id2 not in self.index:
+            return None
+        e = self._edge_slot(self.index[node_id1], self.index[node_id2])
+        if e == -1:
+            return None
+        return EdgeData(node_id1, node_id2, self.out_weights[e])
+
+    def get_node(self, node_id) -> NodeData or None:
+        """
+        :param node_id: the id of the node
+        :return: the node associated with node_id, None if it is not in the graph
+        """
+        if node_id not in self.index:
+            return None
+        if self._nodes is not None:
+            return self._nodes[node_id]
+        return NodeData(node_id, pos=self.get_pos(self.index[node_id]))
+
+    def __eq__(self, o: object) -> bool:
+        for key in self.index:
+            if o.get_node(key) is None:
+                return False
+        return True
+
+    def __repr__(self):
+        return f"CSRGraph[Node_size:{self.v_size()},Edge_size:{self.e_size()}]"
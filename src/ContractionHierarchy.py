@@ -0,0 +1,231 @@
+import heapq
+import json
+import math
+
+from src import GraphInterface
+
+
+class ContractionHierarchy:
+    """
+    This class represent a contraction hierarchy index - https://en.wikipedia.org/wiki/Contraction_hierarchies
+    the vertices are contracted one by one (the least important first), contracting v adds a shortcut u->x
+    for every path u->v->x that has no other path (witness) as short as it. a query is a bidirectional
+    Dijkstra's search that goes only "up" the hierarchy, so it settles very few vertices,
+    the shortcuts of the found path are unpacked back into the original vertices.
+    the index belongs to one state of one graph object (its mode count), it is stale once the graph changes,
+    a saved index keeps the fingerprint of the graph instead (see LandmarkIndex)
+    """
+
+    def __init__(self, rank: dict, up: dict, down: dict, middle: dict, graph: GraphInterface = None,
+                 fingerprint: int = None):
+        """
+        :param rank: vertex key -> its contraction order
+        :param up: vertex key -> list of (x, weight) of the edges (and shortcuts) vertex->x to higher ranked x
+        :param down: vertex key -> list of (u, weight) of the edges (and shortcuts) u->vertex from higher ranked u
+        :param middle: (u, x) -> the contracted vertex a shortcut u->x goes through
+        :param graph: the graph the index was built on, None for an index loaded from a file (see attach)
+        :param fingerprint: the fingerprint of that graph, read from the file of a loaded index
+        """
+        self.rank = rank
+        self.up = up
+        self.down = down
+        self.middle = middle
+        self.fingerprint = fingerprint
+        self.graph = None
+        self.mc = None
+        if graph is not None:
+            self.attach(graph)
+
+    # --------------------------- preprocessing ------------------------ #
+    @classmethod
+    def build(cls, graph: GraphInterface, witness_limit: int = 60) -> 'ContractionHierarchy':
+        """
+        contract all the vertices of the graph, the next vertex is the one with the lowest
+        edge difference (shortcuts added - edges removed) plus the number of its contracted neighbors,
+        the priorities are updated lazily (a popped vertex is checked again before it is contracted)
+        :param graph: the graph (DiGraph or CSRGraph)
+        :param witness_limit: max number of vertices a witness search settles, a lower limit builds
+                              faster but adds more (unneeded) shortcuts
+        :return: ContractionHierarchy of the graph
+        """
+        out = {key: {} for key in graph.get_all_v()}
+        inn = {key: {} for key in out}
+        for key in out:
+            for dest, weight in graph.out_arcs(key):
+                out[key][dest] = weight
+                inn[dest][key] = weight
+        middle = {}
+        rank, up, down = {}, {}, {}
+        contracted_neighbors = dict.fromkeys(out, 0)
+
+        def priority(v: int) -> int:
+            shortcuts = cls._shortcuts(out, inn, v, witness_limit)
+            return len(shortcuts) - len(out[v]) - len(inn[v]) + contracted_neighbors[v]
+
+        heap = [(priority(v), v) for v in out]
+        heapq.heapify(heap)
+        while heap:
+            p, v = heapq.heappop(heap)
+            current = priority(v)
+            if heap and current > heap[0][0]:  # lazy update - v is not the least important anymore
+                heapq.heappush(heap, (current, v))
+                continue
+            for u, x, weight in cls._shortcuts(out, inn, v, witness_limit):
+                if weight < out[u].get(x, math.inf):
+                    out[u][x] = weight
+                    inn[x][u] = weight
+                    middle[(u, x)] = v
+            rank[v] = len(rank)
+            up[v] = list(out[v].items())  # every vertex that is left has a higher rank
+            down[v] = list(inn[v].items())
+            for x in out[v]:
+                del inn[x][v]
+                contracted_neighbors[x] += 1
+            for u in inn[v]:
+                del out[u][v]
+                contracted_neighbors[u] += 1
+            del out[v], inn[v]
+        return cls(rank, up, down, middle, graph)
+
+    @staticmethod
+    def _shortcuts(out: dict, inn: dict, v: int, witness_limit: int) -> list:
+        """
+        find the shortcuts that contracting v needs
+        :return: list of (u, x, weight) for every u->v->x with no witness path of at most the same weight
+        """
+        shortcuts = []
+        for u, w1 in inn[v].items():
+            targets = [(x, w2) for x, w2 in out[v].items() if x != u]
+            if not targets:
+                continue
+            max_cost = w1 + max(w2 for x, w2 in targets)
+            dist = {u: 0.0}  # witness search - Dijkstra's from u without v, bounded by cost and size
+            heap = [(0.0, u)]
+            settled = 0
+            while heap and settled < witness_limit:
+                d, a = heapq.heappop(heap)
+                if d > dist[a]:  # stale entry
+                    continue
+                if d > max_cost:
+                    break
+                settled += 1
+                for b, w in out[a].items():
+                    if b != v and d + w < dist.get(b, math.inf):
+                        dist[b] = d + w
+                        heapq.heappush(heap, (d + w, b))
+            for x, w2 in targets:
+                if dist.get(x, math.inf) > w1 + w2:  # no witness
+                    shortcuts.append((u, x, w1 + w2))
+        return shortcuts
+
+    # --------------------------- queries ------------------------ #
+    def attach(self, graph: GraphInterface) -> None:
+        """
+        tie the index to a graph as it is now (the caller checked that the index matches it)
+        """
+        self.graph = graph
+        self.mc = graph.get_mc()
+
+    def is_valid_for(self, graph: GraphInterface) -> bool:
+        """
+        :param graph: GraphInterface
+        :return: true if the index was built on this graph object as it is now
+        """
+        return graph is not None and graph is self.graph and graph.get_mc() == self.mc
+
+    def shortest_path(self, id1: int, id2: int) -> (float, list):
+        """
+        bidirectional upward search, the forward side follows up from id1 and the backward side follows
+        down from id2, each side stops once its queue head is not smaller than the best meeting found
+        :param id1: the src node
+        :param id2: the dest node
+        :return: the distance of the path and the list of the nodes on it, (inf, []) if there is no path
+        """
+        if id1 not in self.rank or id2 not in self.rank:
+            return (float('inf'), [])
+        dist = ({id1: 0.0}, {id2: 0.0})  # forward, backward
+        parent = ({id1: None}, {id2: None})
+        heaps = ([(0.0, id1)], [(0.0, id2)])
+        arcs = (self.up, self.down)
+        best, meet = (0.0, id1) if id1 == id2 else (math.inf, None)
+        side = 0
+        while heaps[0] or heaps[1]:
+            if not heaps[side] or heaps[side][0][0] >= best:
+                heaps[side].clear()  # this side can not improve the best path anymore
+                side = 1 - side
+                continue
+            weight, v = heapq.heappop(heaps[side])
+            my_dist, other_dist = dist[side], dist[1 - side]
+            if weight > my_dist[v]:  # stale entry
+                continue
+            if v in other_dist and weight + other_dist[v] < best:
+                best, meet = weight + other_dist[v], v
+            for x, w in arcs[side][v]:
+                if weight + w < my_dist.get(x, math.inf):
+                    my_dist[x] = weight + w
+                    parent[side][x] = v
+                    heapq.heappush(heaps[side], (weight + w, x))
+            side = 1 - side
+        if meet is None:
+            return (float('inf'), [])
+        hops = []
+        key = meet
+        while parent[0][key] is not None:  # id1 ... meet (reversed)
+            hops.append((parent[0][key], key))
+            key = parent[0][key]
+        hops.reverse()
+        key = meet
+        while parent[1][key] is not None:  # meet ... id2
+            hops.append((key, parent[1][key]))
+            key = parent[1][key]
+        path = [id1]
+        for u, x in hops:
+            path.extend(self._unpack(u, x))
+        return (best, path)
+
+    def _unpack(self, u: int, x: int) -> list:
+        """
+        :return: the original vertices of the edge (or shortcut) u->x, without u
+        """
+        vertices = []
+        stack = [(u, x)]
+        while stack:
+            a, b = stack.pop()
+            m = self.middle.get((a, b))
+            if m is None:  # original edge
+                vertices.append(b)
+            else:  # a->m->b, m is contracted before a and b
+                stack.append((m, b))
+                stack.append((a, m))
+        return vertices
+
+    # --------------------------- save/load ------------------------ #
+    def save(self, file_name: str, fingerprint: int) -> None:
+        """
+        save the index into a json file
+        :param file_name: the path of the file
+        :param fingerprint: the fingerprint of the graph the index was built on
+        """
+        with open(file_name, "w") as file:
+            json.dump({"fingerprint": fingerprint,
+                       "rank": list(self.rank.items()),
+                       "up": [[v, arcs] for v, arcs in self.up.items()],
+                       "down": [[v, arcs] for v, arcs in self.down.items()],
+                       "middle": [[u, x, m] for (u, x), m in self.middle.items()]}, fp=file)
+
+    @classmethod
+    def load(cls, file_name: str) -> 'ContractionHierarchy':
+        """
+        :param file_name: the path of a file written by save
+        :return: ContractionHierarchy
+        """
+        with open(file_name, "r") as file:
+            data = json.load(file)
+        rank = {v: r for v, r in data["rank"]}
+        up = {v: [(x, w) for x, w in arcs] for v, arcs in data["up"]}
+        down = {v: [(u, w) for u, w in arcs] for v, arcs in data["down"]}
+        middle = {(u, x): m for u, x, m in data["middle"]}
+        return cls(rank, up, down, middle, fingerprint=data["fingerprint"])
+
+    def __repr__(self):
+        return f"ContractionHierarchy[Node_size:{len(self.rank)},shortcuts:{len(self.middle)}]"
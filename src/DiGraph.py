@@ -4,6 +4,7 @@ from src.GraphInterface import GraphInterface
 
 
 class DiGraph(GraphInterface):
+    journal_limit = 1024  # max number of changes kept in the change journal
 
     def __init__(self):
         self.Nodes = {}
@@ -13,6 +14,10 @@ class DiGraph(GraphInterface):
         self.MC = 0
         self.VSize = 0
         self.ESize = 0
+        self.journal = []  # (mode count, operation, id1, id2) of the last changes, oldest first
+        self.journal_base = 0  # the journal holds every change made after this mode count
+        self.weight_min = float('inf')  # bounds of the weights of the edges added since the graph had no edges
+        self.weight_max = 0.0
 
     def v_size(self) -> int:
         """
@@ -55,11 +60,16 @@ class DiGraph(GraphInterface):
             return False
         else:
             e = EdgeData(id1, id2, weight)
+            if weight < self.weight_min:
+                self.weight_min = weight
+            if weight > self.weight_max:
+                self.weight_max = weight
             self.Edges[id1][id2] = e  # quick access to edges
             self.src_to_dest[id1][id2] = self.get_node(id2)  # add to list id1-->id2
             self.dest_to_src[id2][id1] = self.get_node(id1)  # add to list id2<--id1
             self.ESize += 1
             self.MC += 1
+            self._log("add_edge", id1, id2)
             return True
 
     def add_node(self, node_id: int, pos: tuple = None) -> bool:
@@ -80,9 +90,71 @@ class DiGraph(GraphInterface):
             self.Edges[node_id] = {}  # init new dictionary
             self.VSize += 1  # increase the node size by 1
             self.MC += 1
+            self._log("add_node", node_id)
             ans = True
         return ans
 
+    def add_nodes_from(self, nodes) -> int:
+        """
+        add many vertices in one batch, the mode count is increased once for the whole batch
+        vertices that are already in the graph are skipped (like add_node)
+        :param nodes: iterable of node ids or of (node_id, pos) pairs
+        :return: the number of nodes that were added
+        """
+        all_nodes, src_to_dest, dest_to_src, edges = self.Nodes, self.src_to_dest, self.dest_to_src, self.Edges
+        added = 0
+        logged = []
+        for node in nodes:
+            node_id, pos = node if isinstance(node, tuple) else (node, None)
+            if node_id in all_nodes:  # the node already in the graph
+                continue
+            all_nodes[node_id] = NodeData(node_id, pos=pos)
+            src_to_dest[node_id] = {}
+            dest_to_src[node_id] = {}
+            edges[node_id] = {}
+            added += 1
+            if added <= self.journal_limit:
+                logged.append((node_id, None))
+        self.VSize += added
+        if added:
+            self.MC += 1
+            self._log_batch("add_node", logged, added > self.journal_limit)
+        return added
+
+    def add_edges_from(self, edges) -> int:
+        """
+        connect many pairs of nodes in one batch, the mode count is increased once for the whole batch
+        edges that add_edge would reject (negative weight, self loop, missing node, existing edge) are skipped
+        :param edges: iterable of (src, dest, weight)
+        :return: the number of edges that were added
+        """
+        all_nodes, src_to_dest, dest_to_src, all_edges = self.Nodes, self.src_to_dest, self.dest_to_src, self.Edges
+        added = 0
+        logged = []
+        low, high = self.weight_min, self.weight_max
+        for id1, id2, weight in edges:
+            if weight < 0 or id1 == id2 or id1 not in all_nodes or id2 not in all_nodes:
+                continue
+            out_edges = all_edges[id1]
+            if id2 in out_edges:  # Edge exist already
+                continue
+            out_edges[id2] = EdgeData(id1, id2, weight)
+            if weight < low:
+                low = weight
+            if weight > high:
+                high = weight
+            src_to_dest[id1][id2] = all_nodes[id2]  # add to list id1-->id2
+            dest_to_src[id2][id1] = all_nodes[id1]  # add to list id2<--id1
+            added += 1
+            if added <= self.journal_limit:
+                logged.append((id1, id2))
+        self.ESize += added
+        self.weight_min, self.weight_max = low, high
+        if added:
+            self.MC += 1
+            self._log_batch("add_edge", logged, added > self.journal_limit)
+        return added
+
     def remove_node(self, node_id: int) -> bool:
         """
         remove the vertex that associated with the given node_id from the graph
@@ -106,6 +178,8 @@ class DiGraph(GraphInterface):
             self.dest_to_src.pop(node_id)
             self.MC += 1
             self.VSize -= 1
+            self._reset_weights()
+            self._log("remove_node", node_id)
             return True
 
     def remove_edge(self, node_id1: int, node_id2: int) -> bool:
@@ -121,11 +195,69 @@ class DiGraph(GraphInterface):
             del self.dest_to_src[node_id2][node_id1]
             self.ESize -= 1
             self.MC += 1
+            self._reset_weights()
+            self._log("remove_edge", node_id1, node_id2)
             ans = True
         else:  # if there is no edge between them return false
             ans = False
         return ans
 
+    def weight_range(self) -> (float, float):
+        """
+        bounds of the edge weights, kept up to date as edges are added - removing an edge does not
+        narrow them (every weight is still between them), they start over once the graph has no edges
+        :return: (min weight, max weight), (inf, 0.0) if the graph has no edges
+        """
+        return self.weight_min, self.weight_max
+
+    def _reset_weights(self) -> None:
+        """
+        start the weight bounds over if the last edge was removed
+        """
+        if self.ESize == 0:
+            self.weight_min = float('inf')
+            self.weight_max = 0.0
+
+    def changes_since(self, mc: int) -> list or None:
+        """
+        the change journal - lets algorithms that keep results between calls update them
+        instead of computing them again
+        :param mc: a mode count of this graph
+        :return: list of (mode count, operation, id1, id2) of the changes made after mc, oldest first,
+                 operation is "add_node", "remove_node", "add_edge" or "remove_edge" (id2 is None for nodes),
+                 None if the journal does not go back to mc
+        """
+        if mc < self.journal_base or mc > self.MC:
+            return None
+        journal = self.journal
+        i = len(journal)
+        while i > 0 and journal[i - 1][0] > mc:
+            i -= 1
+        return journal[i:]
+
+    def _log(self, operation: str, id1: int, id2: int = None) -> None:
+        """
+        add a change to the journal (after the mode count was increased), the oldest half is dropped when it is full
+        """
+        self.journal.append((self.MC, operation, id1, id2))
+        if len(self.journal) > self.journal_limit:
+            drop = len(self.journal) - self.journal_limit // 2
+            self.journal_base = self.journal[drop - 1][0]
+            del self.journal[:drop]
+
+    def _log_batch(self, operation: str, items: list, overflow: bool) -> None:
+        """
+        add the changes of a batch (one mode count), a batch larger than the journal restarts it
+        :param items: list of (id1, id2)
+        :param overflow: true if the batch had more changes than the items kept
+        """
+        if overflow:
+            self.journal.clear()
+            self.journal_base = self.MC
+            return
+        for id1, id2 in items:
+            self._log(operation, id1, id2)
+
     def get_all_v(self) -> dict:
         """
         This method return a dictionary represents the nodes in the Graph
@@ -149,6 +281,23 @@ class DiGraph(GraphInterface):
         """
         return self.src_to_dest[id1]
 
+    def out_arcs(self, id1: int):
+        """
+        iterate over the edges going out of id1 without creating objects for them
+        :param id1: the id of the node
+        :return: iterator of (dest node id, weight)
+        """
+        return ((dest, edge.weight) for dest, edge in self.Edges[id1].items())
+
+    def in_arcs(self, id1: int):
+        """
+        iterate over the edges coming into id1 without creating objects for them
+        :param id1: the id of the node
+        :return: iterator of (src node id, weight)
+        """
+        edges = self.Edges
+        return ((src, edges[src][id1].weight) for src in self.dest_to_src[id1])
+
     def has_edge(self, node_id1: int, node_id2: int) -> bool:
         """
          return true if there is an edge between node_id1 to node_id2
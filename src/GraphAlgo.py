@@ -1,18 +1,35 @@
 import heapq
 import json
 import math
+import os
+from array import array
 from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate, repeat
 from random import randint
 from typing import List
 
 import matplotlib.pyplot as plt
+import numpy as np
 from matplotlib.patches import ConnectionPatch
 
 from src import GraphInterface
 from src.AbstractGraph import AbstractGraph as AG
+from src.algo_cache import AlgoCache
+from src.all_pairs_paths import AllPairsPaths
+from src.batch_search import bounded_distances, bounded_paths, init_worker, worker_distances, worker_paths
+from src.condensation import Condensation
+from src.ContractionHierarchy import ContractionHierarchy
+from src.CSRGraph import CSRGraph
 from src.DiGraph import DiGraph
+from src.graph_json import read_graph_json
 from src.GraphAlgoInterface import GraphAlgoInterface
+from src.indexed_heap import IndexedHeap
+from src.landmarks import LandmarkIndex
 from src.node_data import NodeData
+from src.scc_index import SCCIndex
+from src.shortest_path_tree import ShortestPathTree
+from src import sparse_scc
 
 
 class GraphAlgo(GraphAlgoInterface):
@@ -24,46 +41,21 @@ class GraphAlgo(GraphAlgoInterface):
     each method in this class is attached with explanations.
     """
 
-    # ---------------------inner class--------------------- #
-    class SubNode:
-        """
-        This inner class used in Dijkstra's Algorithm
-        """
-
-        def __init__(self, parent: int, current: int, weight: float = math.inf, name = None):
-            self.parent_key = parent
-            self.current_key = current
-            self.weight = weight
+    bucket_limit = 4096  # the bucket queue is used only if max weight / min weight is not larger than this
 
-            #  *--------Trajan's variables-----------*
-            self.name = name
-            self.index = None
-            self.lowlink = None
-            self.adj = []
-            self.on_stack = False
-
-        def __repr__(self):
-            return f"cur_key:{self.current_key},p_key:{self.parent_key},weight:{self.weight}"
-
-        def __le__(self, other):
-            if self.weight < other.weight:
-                return -1
-            else:
-                return 1
+    # ---------------------GraphAlgo methods--------------------- #
 
-        def __lt__(self, other):
-            if self.weight < other.weight:
-                return -1
-            else:
-                return 1
-            # ---------------------GraphAlgo methods--------------------- #
-
-    def __init__(self, graph: GraphInterface = None):
+    def __init__(self, graph: GraphInterface = None, cache_size: int = 16):
         """
         init graph algo to work on a specific graph
         :param graph: the graph of GraphAlgo
+        :param cache_size: the max number of shortest path trees / SCC results kept between calls
         """
         self.Graph = graph
+        self.cache = AlgoCache(cache_size)
+        self.landmarks = None  # LandmarkIndex of the "alt" shortest path method
+        self.hierarchy = None  # ContractionHierarchy of the "ch" shortest path method
+        self.scc_index = None  # SCCIndex kept up to date from the change journal of the graph
 
     def get_graph(self) -> GraphInterface:
         """
@@ -71,6 +63,19 @@ class GraphAlgo(GraphAlgoInterface):
         """
         return self.Graph
 
+    def cache_info(self) -> dict:
+        """
+        :return: dictionary with the hits, misses, size and capacity of the results cache
+        """
+        return self.cache.info()
+
+    def _cache(self) -> AlgoCache:
+        """
+        :return: the results cache, emptied first if the graph was changed since it was filled
+        """
+        self.cache.validate(self.Graph)
+        return self.cache
+
     def load_from_json(self, file_name: str) -> bool:
         """
         load graph represents in a json file , this load method support two types of json files
@@ -80,47 +85,16 @@ class GraphAlgo(GraphAlgoInterface):
         loaded = False
         g = DiGraph()
         try:
-            with open(file_name, "r") as file:
-                my_graph = json.load(file)
-                # empty graph case:
-                if my_graph is None:
-                    g = DiGraph()
-                    self.Graph = g
-                    loaded = True
-                    return True
-                # the graph is not empty
-                list_of_nodes = my_graph["Nodes"]
-                list_of_edges = my_graph["Edges"]
-
-                try:
-                    for k in list_of_nodes:
-                        if 'pos' in k:  # the node has a position
-                            p = tuple(float(i) for i in k["pos"].strip("()").split(","))  # string to float
-                            g.add_node(k["id"], p)
-                        else:  # add only the key of the node
-                            g.add_node(k["id"])
-                    for k in list_of_edges:  # add the edges
-                        g.add_edge(k["src"], k["dest"], k["w"])
-                except AttributeError:  # the second json format
-                    for k in list_of_nodes:
-                        if "pos" in k:  # the node has a position
-                            try:
-                                p = tuple(float(i) for i in k["pos"].strip("()").split(","))  # string to flaot
-                                g.add_node(k["key"], p)  # add the key and the pos
-                            except AttributeError:
-                                p = k.get("pos")
-                                g.add_node(k["key"], (float(p[0]), float(p[1]), float(p[2])))  # string to float
-                        else:
-                            g.add_node(k["key"])  # add the key of the node
-
-                    for k in list_of_edges:  # add the edges
-                        g.add_edge(k["src"], k["dest"], k["weight"])
-
-                loaded = True
-        except IOError as ex:
+            nodes, edges = read_graph_json(file_name)  # streamed, the format is detected once
+            g.add_nodes_from(nodes)
+            g.add_edges_from(edges)  # add the edges
+            loaded = True
+        except (IOError, ValueError, TypeError, KeyError) as ex:  # missing file, broken json or a bad item
             print(ex)
         finally:
             self.Graph = g  # init the graph
+            self.landmarks = None  # the indexes of the previous graph
+            self.hierarchy = None
             return loaded
 
     def save_to_json(self, file_name: str) -> bool:
@@ -148,66 +122,556 @@ class GraphAlgo(GraphAlgoInterface):
             graph_obj = AG(Nodes, Edges)
             try:  # use dump from the AG object
                 with open(file_name, "w") as file:
-                    json.dump(graph_obj, default=lambda o: o.__dict__, fp=file)
+                    json.dump(graph_obj, default=lambda o: o.__dict__ if hasattr(o, "__dict__")
+                              else {k: getattr(o, k) for k in o.__slots__}, fp=file)
                     saved = True
             except IOError as ex:
                 print(ex)
             finally:
                 return saved
 
-    def shortest_path(self, id1: int, id2: int) -> (float, list):
+    def save_binary(self, file_name: str) -> bool:
+        """
+        save the graph into a binary snapshot (see CSRGraph.save) - flat arrays with a versioned,
+        checksummed header, much faster to load than json
+        :param file_name: the path of the file
+        :return: true if the save process was completed successfully, else return false
+        """
+        saved = False
+        graph = self.get_graph()
+        if graph is None:  # the graph is empty
+            graph = DiGraph()
+        try:
+            snapshot = graph if isinstance(graph, CSRGraph) else CSRGraph.from_digraph(graph)
+            snapshot.save(file_name)
+            saved = True
+        except (IOError, TypeError, OverflowError) as ex:  # keys that are not int64 can not be saved
+            print(ex)
+        return saved
+
+    def load_binary(self, file_name: str, read_only: bool = False, mapped: bool = False) -> bool:
+        """
+        load a graph from a binary snapshot written by save_binary
+        :param file_name: the path of the file
+        :param read_only: if true GraphAlgo works on the loaded CSRGraph as it is (no per element work),
+                          else the snapshot is turned into a DiGraph that can be changed
+        :param mapped: if true the file is memory mapped instead of read (see CSRGraph.open_mapped),
+                       the graph is read only and shared with every other process that maps the same file
+        :return: true if the loading process was completed successfully, else return false
+        """
+        loaded = False
+        g = DiGraph()
+        try:
+            if mapped:
+                g = CSRGraph.open_mapped(file_name)
+            else:
+                snapshot = CSRGraph.load(file_name)
+                g = snapshot if read_only else snapshot.to_digraph()
+            loaded = True
+        except (IOError, ValueError) as ex:
+            print(ex)
+        finally:
+            self.Graph = g  # init the graph
+            self.landmarks = None  # the indexes of the previous graph
+            self.hierarchy = None
+            return loaded
+
+    def preprocess_landmarks(self, k: int = 8) -> LandmarkIndex or None:
+        """
+        pick k landmarks and keep the distances from and to each of them for the "alt" shortest path method.
+        the landmarks are picked one by one (farthest first): the first is the first vertex of the graph,
+        each next one is the vertex with the largest distance from its closest landmark so far
+        (vertices none of the landmarks reach come first)
+        :param k: the number of landmarks
+        :return: the LandmarkIndex (also kept in self.landmarks), None if the graph is empty
+        """
+        graph = self.Graph
+        if graph is None or graph.v_size() == 0:
+            return None
+        keys = list(graph.get_all_v())
+        landmarks, forward, backward = [], [], []
+        closest = dict.fromkeys(keys, math.inf)  # distance of each vertex from its closest landmark
+        landmark = keys[0]
+        while len(landmarks) < min(k, len(keys)):
+            landmarks.append(landmark)
+            forward.append(self._distances(landmark))
+            backward.append(self._distances(landmark, reverse=True))
+            for key, d in forward[-1].items():
+                if d < closest[key]:
+                    closest[key] = d
+            for chosen in landmarks:
+                closest[chosen] = -1.0  # never pick a landmark twice
+            landmark = max(keys, key=closest.get)
+        self.landmarks = LandmarkIndex(landmarks, forward, backward, graph)
+        return self.landmarks
+
+    def save_landmarks(self, file_name: str) -> bool:
+        """
+        save the landmark index into a json file, usually next to the graph file (for example "A5.landmarks")
+        :param file_name: the path of the file
+        :return: true if the save process was completed successfully, else return false
+        """
+        if self.landmarks is None or not self.landmarks.is_valid_for(self.Graph):
+            return False
+        try:
+            self.landmarks.save(file_name, self._fingerprint())
+            return True
+        except (IOError, ValueError) as ex:  # keys that do not fit a CSRGraph have no fingerprint
+            print(ex)
+            return False
+
+    def load_landmarks(self, file_name: str) -> bool:
+        """
+        load a landmark index saved by save_landmarks, it is used only if it matches the current graph
+        :param file_name: the path of the file
+        :return: true if the index was loaded and is up to date with the graph, else return false
+        """
+        if self.Graph is None:
+            return False
+        try:
+            index = LandmarkIndex.load(file_name)
+            if index.fingerprint != self._fingerprint():  # saved for another graph, or the graph was changed since
+                return False
+        except (IOError, ValueError, KeyError) as ex:
+            print(ex)
+            return False
+        index.attach(self.Graph)
+        self.landmarks = index
+        return True
+
+    def preprocess_hierarchy(self, witness_limit: int = 60) -> ContractionHierarchy or None:
+        """
+        build a contraction hierarchy of the graph for the "ch" shortest path method,
+        the preprocessing is slow but each query then settles only a few vertices
+        :param witness_limit: max number of vertices each witness search settles
+        :return: the ContractionHierarchy (also kept in self.hierarchy), None if there is no graph
+        """
+        if self.Graph is None:
+            return None
+        self.hierarchy = ContractionHierarchy.build(self.Graph, witness_limit)
+        return self.hierarchy
+
+    def save_hierarchy(self, file_name: str) -> bool:
+        """
+        save the contraction hierarchy into a json file, usually next to the graph file (for example "A5.ch")
+        :param file_name: the path of the file
+        :return: true if the save process was completed successfully, else return false
+        """
+        if self.hierarchy is None or not self.hierarchy.is_valid_for(self.Graph):
+            return False
+        try:
+            self.hierarchy.save(file_name, self._fingerprint())
+            return True
+        except (IOError, ValueError) as ex:  # keys that do not fit a CSRGraph have no fingerprint
+            print(ex)
+            return False
+
+    def load_hierarchy(self, file_name: str) -> bool:
+        """
+        load a contraction hierarchy saved by save_hierarchy, it is used only if it matches the current graph
+        :param file_name: the path of the file
+        :return: true if the index was loaded and is up to date with the graph, else return false
+        """
+        if self.Graph is None:
+            return False
+        try:
+            index = ContractionHierarchy.load(file_name)
+            if index.fingerprint != self._fingerprint():  # saved for another graph, or the graph was changed since
+                return False
+        except (IOError, ValueError, KeyError) as ex:
+            print(ex)
+            return False
+        index.attach(self.Graph)
+        self.hierarchy = index
+        return True
+
+    def shortest_path(self, id1: int, id2: int, method: str = "dijkstra") -> (float, list):
         """
           return list represent the shortest path from the source vertex to the destination vertex
          src--->node1---->node2----->...----->dest
         this method based on Dijkstra's algorithm.
         :param id1:the src node
         :param id2:the dest node
+        :param method: "dijkstra" - forward search, the search tree of id1 is cached for the next queries
+                       "bidirectional" - forward search from id1 and backward search from id2 (not cached)
+                       "astar" - A* guided by the node positions, falls back to "dijkstra" when the
+                       positions can not give an admissible heuristic (see astar_scale)
+                       "alt" - A* guided by the landmarks of preprocess_landmarks, falls back to "astar"
+                       when there is no up to date landmark index
+                       "ch" - upward search over the contraction hierarchy of preprocess_hierarchy,
+                       falls back to "bidirectional" when there is no up to date hierarchy
         :return: list of the shortest path
         """
-        if id1 not in self.Graph.Nodes or id2 not in self.Graph.Nodes:
+        if self.Graph.get_node(id1) is None or self.Graph.get_node(id2) is None:
             return (float('inf'), [])  # there is no path
-        s_path = [float, []]
-        p_t = self.dijkstras(self.get_graph().get_node(id1), self.get_graph().get_node(id2))
-        i, size, no_path = 0, len(p_t[1]), 0
-        p_s_node = self.get_sub_node(p_t[1], id2)  # get_sub_node return the node by the give key from the list
-        if p_s_node is None: return (float('inf'), [])  # get_sub_node returned None= there is no path
-        s_path[1].append(p_s_node.current_key)  # add to the list
-        s_path[0] = p_s_node.weight  # the shortest path weight
-        while p_s_node.current_key != id1:
-            s_path[1].append(p_s_node.parent_key)  # add the parent
-            p_s_node = self.get_sub_node(p_t[1], p_s_node.parent_key)  # to get his parent
-            if no_path == size - 1:  # there is no path
-                return (float('inf'), [])
-            no_path += 1
-        s_path[1].reverse()  # reverse the list
-        return tuple(s_path)
-
-    def connected_component(self, id1: int) -> list:
+        if method == "ch":
+            if self.hierarchy is not None and self.hierarchy.is_valid_for(self.Graph):
+                return self.hierarchy.shortest_path(id1, id2)
+            self.hierarchy = None  # missing or stale
+            method = "bidirectional"
+        if method == "bidirectional":
+            return self.bidirectional_dijkstras(id1, id2)
+        if method == "alt":
+            if self.landmarks is not None and self.landmarks.is_valid_for(self.Graph):
+                return self.astar(id1, id2, self.landmarks.heuristic(id2))
+            self.landmarks = None  # missing or stale - the graph was changed since the preprocessing
+            method = "astar"
+        if method == "astar":
+            scale = self.astar_scale()
+            if scale > 0:
+                nodes = self.Graph.get_all_v()
+                target = nodes[id2].pos
+                return self.astar(id1, id2, lambda v: scale * math.dist(nodes[v].pos, target))
+            method = "dijkstra"
+        if method != "dijkstra":
+            raise ValueError(f"unknown shortest path method: {method}")
+        cache = self._cache()
+        tree = cache.get(("sp", id1), usable=lambda t: t.covers(id2))
+        if tree is None:  # run Dijkstra's only until id2 is settled and keep the partial tree
+            dist, parent = self.dijkstras(self.get_graph().get_node(id1), self.get_graph().get_node(id2))
+            tree = ShortestPathTree(id1, dist, parent, complete=id2 not in dist)
+            cache.put(("sp", id1), tree)
+        return tree.path(id2)
+
+    def distance_matrix(self, sources: list, targets: list, workers: int = None) -> np.ndarray:
+        """
+        the distances between every source and every target, one Dijkstra's search is run from each
+        source over a CSR snapshot of the graph and it stops as soon as all the targets are settled
+        :param sources: the keys of the sources
+        :param targets: the keys of the targets
+        :param workers: number of processes to spread the sources over, None (or 1) to run in this process
+        :return: matrix of len(sources) x len(targets), matrix[i][j] is the weight of the shortest path
+                 from sources[i] to targets[j] (inf if there is no path or one of them is not in the graph)
+        :raise ValueError: if the node keys are not int64 (see _snapshot)
+        """
+        sources, targets = list(sources), list(targets)
+        matrix = np.full((len(sources), len(targets)), math.inf)
+        if self.Graph is None or not sources or not targets:
+            return matrix
+        graph = self._snapshot()
+        if workers is None or workers <= 1 or len(sources) == 1:
+            rows = [bounded_distances(graph, src, targets) for src in sources]
+        else:
+            size = -(-len(sources) // (4 * workers))  # a few chunks per worker to balance the load
+            chunks = [sources[i:i + size] for i in range(0, len(sources), size)]
+            with self._pool(graph, workers) as pool:
+                rows = [row for chunk in pool.map(worker_distances, chunks, repeat(targets)) for row in chunk]
+        matrix[:] = rows
+        return matrix
+
+    def shortest_paths_parallel(self, pairs: list, workers: int = None) -> list:
+        """
+        answer many shortest path queries in worker processes (the search is CPU bound so threads do not help).
+        a read only CSR snapshot of the graph is handed to each worker once when the pool starts, the queries
+        are grouped by source (one search per source that stops once all its destinations are settled)
+        and the groups are split into a few batches per worker
+        :param pairs: list of (src, dest)
+        :param workers: number of processes, None for the number of CPUs, 1 to run in this process
+        :return: list of (distance, path) in the order of pairs, the same as shortest_path of each pair
+        :raise ValueError: if the node keys are not int64 (see _snapshot)
+        """
+        pairs = list(pairs)
+        if self.Graph is None or not pairs:
+            return [(float('inf'), []) for pair in pairs]
+        graph = self._snapshot()
+        groups = {}  # src -> (positions, targets)
+        for position, (src, dest) in enumerate(pairs):
+            positions, targets = groups.setdefault(src, ([], []))
+            positions.append(position)
+            targets.append(dest)
+        workers = workers or os.cpu_count() or 1
+        result = [None] * len(pairs)
+        if workers <= 1 or len(groups) == 1:
+            for src, (positions, targets) in groups.items():
+                for position, path in zip(positions, bounded_paths(graph, src, targets)):
+                    result[position] = path
+            return result
+        groups = [(src, positions, targets) for src, (positions, targets) in groups.items()]
+        size = -(-len(groups) // (4 * workers))
+        batches = [groups[i:i + size] for i in range(0, len(groups), size)]
+        with self._pool(graph, workers) as pool:
+            for answers in pool.map(worker_paths, batches):
+                for position, path in answers:
+                    result[position] = path
+        return result
+
+    @staticmethod
+    def _pool(graph: CSRGraph, workers: int) -> ProcessPoolExecutor:
+        """
+        :return: process pool whose workers hold the snapshot (see batch_search.init_worker), a memory mapped
+                 graph is handed over by its file name so the workers map the same file instead of copying it
+        """
+        snapshot = graph.file_name if graph.file_name is not None else graph
+        return ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(snapshot,))
+
+    def all_pairs_shortest_paths(self, method: str = None) -> AllPairsPaths or None:
+        """
+        the shortest paths between every pair of vertices (meant for graphs of up to a few thousands vertices,
+        the result holds two n x n matrices), the result is kept in the cache until the graph changes
+        :param method: "floyd_warshall" - vectorized numpy Floyd-Warshall, "dijkstra" - one search from each vertex,
+                       None to pick by the density of the graph
+        :return: AllPairsPaths (distance and next hop matrices, path(src, dest) gives the same answer as
+                 shortest_path), None if there is no graph
+        :raise ValueError: if the method is unknown or the node keys are not int64 (see _snapshot)
+        """
+        if self.Graph is None:
+            return None
+        cache = self._cache()
+        result = cache.get("apsp")
+        if result is not None and method is None:
+            return result
+        graph = self._snapshot()
+        if method is None:
+            n, m = graph.v_size(), graph.e_size()
+            # measured per source: ~5.5ns per matrix cell for Floyd-Warshall,
+            # ~2.5us per vertex plus ~0.35us per edge for Dijkstra's
+            method = "floyd_warshall" if 5.5e-9 * n * n <= 2.5e-6 * n + 3.5e-7 * m else "dijkstra"
+        if method == "floyd_warshall":
+            result = AllPairsPaths.floyd_warshall(graph)
+        elif method == "dijkstra":
+            result = AllPairsPaths.repeated_dijkstra(graph)
+        else:
+            raise ValueError(f"unknown all pairs shortest paths method: {method}")
+        cache.put("apsp", result)
+        return result
+
+    def _fingerprint(self) -> int:
+        """
+        :return: the fingerprint of the graph (see CSRGraph.fingerprint), kept in the cache until the graph changes
+        """
+        cache = self._cache()
+        fingerprint = cache.get("fingerprint")
+        if fingerprint is None:
+            fingerprint = self._snapshot().fingerprint()
+            cache.put("fingerprint", fingerprint)
+        return fingerprint
+
+    def _snapshot(self) -> CSRGraph:
+        """
+        :return: CSRGraph of the graph (the graph itself if it is one), kept in the cache until the graph changes
+        :raise ValueError: if the node keys are not int64 (for example string ids from a json file),
+                           a CSRGraph keeps them in an int64 array
+        """
+        if isinstance(self.Graph, CSRGraph):
+            return self.Graph
+        cache = self._cache()
+        snapshot = cache.get("csr")
+        if snapshot is None:
+            try:
+                snapshot = CSRGraph.from_digraph(self.Graph)
+            except (TypeError, OverflowError) as ex:
+                raise ValueError(f"a CSR snapshot needs int64 node keys: {ex}") from ex
+            cache.put("csr", snapshot)
+        return snapshot
+
+    def shortest_path_tree(self, src: int) -> ShortestPathTree or None:
+        """
+        run Dijkstra's algorithm from src over the whole graph (no early stop) and keep the result,
+        any number of destinations can then be queried from the returned tree in O(path length)
+        :param src: the source node
+        :return: ShortestPathTree of src, None if src is not in the graph
+        """
+        if self.Graph is None or self.Graph.get_node(src) is None:
+            return None
+        cache = self._cache()
+        tree = cache.get(("sp", src), usable=lambda t: t.complete)
+        if tree is None:
+            dist, parent = self.dijkstras(self.Graph.get_node(src))
+            tree = ShortestPathTree(src, dist, parent)
+            cache.put(("sp", src), tree)
+        return tree
+
+    def within_distance(self, src: int, radius: float):
+        """
+        the nodes whose shortest path from src weighs at most radius, the search is lazy - every node is found
+        when it is asked for and nothing beyond radius is expanded
+        :param src: the source node
+        :param radius: the max weight of a path
+        :return: generator of (node key, distance) in increasing distance, src first (distance 0),
+                 empty if src is not in the graph
+        """
+        if self.Graph is None or self.Graph.get_node(src) is None:
+            return
+        for key, weight in self._settle(src, {}, {}):
+            if weight > radius:  # every node that is left is further away
+                return
+            yield key, weight
+
+    def k_nearest(self, src: int, k: int):
+        """
+        the k nodes closest to src (not counting src itself), the search stops once the k-th node is settled
+        :param src: the source node
+        :param k: the number of nodes
+        :return: generator of (node key, distance) in increasing distance, less than k pairs if fewer nodes
+                 are reachable from src, empty if src is not in the graph
+        """
+        if self.Graph is None or self.Graph.get_node(src) is None or k <= 0:
+            return
+        count = 0
+        for key, weight in self._settle(src, {}, {}):
+            if key == src:
+                continue
+            yield key, weight
+            count += 1
+            if count == k:
+                return
+
+    def connected_component(self, id1: int, targeted: bool = False) -> list:
         """
         this function is taking the main trajan's algorithm
         and iterates each list in the list of strongly
         connected components until it finds the
         desired node id, then returns the list it was found at.
+        the components are computed once (see _scc_index) so each next query is a dictionary lookup
+        :param id1: the node key
+        :param targeted: if there are no up to date components yet, compute only the component of id1 -
+                         the nodes id1 reaches that also reach id1 (two searches instead of trajan's algorithm
+                         over the whole graph), the order of the nodes is then the order of the backward search
         Returns
         -------
         """
         if self.get_graph() is None: return []
         if self.Graph.get_node(id1) is None:
             return []
-        listA = self.Trajans()
-        for scc in listA:
-            if id1 in scc:
-                return scc
-        return []
+        if targeted:
+            cache = self._cache()
+            index = self.scc_index
+            if index is None or index.graph is not self.Graph or index.mc != self.Graph.get_mc():
+                scc = cache.get(("scc_of", id1))
+                if scc is None:
+                    scc = self._reachable(id1, reverse=True, within=self._reachable(id1))
+                    cache.put(("scc_of", id1), scc)
+                return list(scc)
+        return list(self._scc_index().component(id1))
 
-    def connected_components(self) -> List[list]:
+    def _reachable(self, src: int, reverse: bool = False, within: list = None) -> list:
+        """
+        iterative DFS from src
+        :param src: the start node
+        :param reverse: follow the in edges (the nodes that reach src) instead of the out edges
+        :param within: optional list of nodes, the search does not leave them
+        :return: list of the nodes that were reached (src first)
+        """
+        graph = self.Graph
+        if isinstance(graph, CSRGraph):  # over the arrays, by vertex index
+            offsets, targets = (graph.in_offsets, graph.in_sources) if reverse else (graph.out_offsets, graph.out_targets)
+            index, keys = graph.index, graph.keys
+            if within is None:
+                seen = bytearray(len(keys))
+            else:
+                seen = bytearray(b"\x01") * len(keys)
+                for key in within:
+                    seen[index[key]] = 0
+            s = index[src]
+            seen[s] = 1
+            found = [s]
+            stack = [s]
+            while stack:
+                v = stack.pop()
+                for u in targets[offsets[v]:offsets[v + 1]]:
+                    if not seen[u]:
+                        seen[u] = 1
+                        found.append(u)
+                        stack.append(u)
+            return [keys[v] for v in found]
+        neighbors = graph.all_in_edges_of_node if reverse else graph.all_out_edges_of_node
+        allowed = set(within) if within is not None else None
+        found = [src]
+        seen = {src}
+        stack = [src]
+        while stack:
+            for key in neighbors(stack.pop()):
+                if key not in seen and (allowed is None or key in allowed):
+                    seen.add(key)
+                    found.append(key)
+                    stack.append(key)
+        return found
+
+    def connected_components(self, method: str = "tarjan") -> List[list]:
         """
         Returns simple returns the value of trajan's algorithm
         aka List(list) of strongly connected components
+        :param method: the SCC engine - "tarjan" (kept up to date between changes, see _scc_index),
+                       "kosaraju", "path" (path-based, Gabow's) or "scipy" (the compiled routine of
+                       scipy.sparse.csgraph, "tarjan" is used if scipy is not installed),
+                       all of them find the same components, the order of the components (and of their nodes)
+                       depends on the engine
         """
         if self.Graph is None:
             return []
-        return self.Trajans()
+        if method == "scipy" and not sparse_scc.available():
+            method = "tarjan"
+        if method == "scipy":
+            cache = self._cache()
+            comps = cache.get(("scc", method))
+            if comps is None:
+                matrix = cache.get("csr_matrix")  # exported once for each mode count
+                if matrix is None:
+                    keys, offsets, targets = self._out_arrays()
+                    matrix = (keys, sparse_scc.adjacency_matrix(offsets, targets))
+                    cache.put("csr_matrix", matrix)
+                comps = sparse_scc.strong_components(matrix[1], matrix[0])
+                cache.put(("scc", method), comps)
+        elif method == "tarjan":
+            comps = self._scc_index().components()
+        elif method in ("kosaraju", "path"):
+            cache = self._cache()
+            comps = cache.get(("scc", method))
+            if comps is None:
+                comps = self.kosaraju() if method == "kosaraju" else self._path_based(*self._out_arrays())
+                cache.put(("scc", method), comps)
+        else:
+            raise ValueError(f"unknown SCC method: {method}")
+        return [list(scc) for scc in comps]  # copies, the cached lists must not be changed
+
+    def condensation(self) -> DiGraph or None:
+        """
+        :return: the DAG of the strongly connected components as a DiGraph - a node for every component
+                 (its key is the component id, see SCCIndex.component_id) and an edge between two components
+                 with the lowest weight of the edges between them, None if there is no graph
+        """
+        if self.Graph is None:
+            return None
+        return self._condensation().to_digraph()
+
+    def reachable(self, id1: int, id2: int) -> bool:
+        """
+        answer "is there a path from id1 to id2" from the reachability labels of the condensation,
+        the labels are built on the first query and again only after the graph was changed
+        :param id1: the src node
+        :param id2: the dest node
+        :return: true if id2 can be reached from id1, false if not or one of them is not in the graph
+        """
+        if self.Graph is None:
+            return False
+        return self._condensation().reachable(id1, id2)
+
+    def _condensation(self) -> Condensation:
+        """
+        :return: the cached Condensation of the graph
+        """
+        cache = self._cache()
+        dag = cache.get("condensation")
+        if dag is None:
+            dag = Condensation(self.Graph, self._scc_index())
+            cache.put("condensation", dag)
+        return dag
+
+    def _scc_index(self) -> SCCIndex:
+        """
+        :return: the strongly connected components of the graph, kept in the cache. after the graph was changed
+                 the previous components are updated from the change journal of the graph (see SCCIndex),
+                 trajan's algorithm runs over the whole graph only if they can not be updated
+        """
+        cache = self._cache()
+        index = cache.get("scc")
+        if index is None:
+            index = self.scc_index
+            if index is None or index.graph is not self.Graph or not index.update():
+                index = SCCIndex(self.Graph, self.Trajans())
+            self.scc_index = index
+            cache.put("scc", index)
+        return index
 
     def plot_graph(self) -> None:
         # data members
@@ -275,14 +739,6 @@ class GraphAlgo(GraphAlgoInterface):
         plt.ylabel('Y')
         plt.show()
 
-    def get_sub_node(self, path: list, key: int) -> SubNode:
-        i = 0
-        size = len(path)
-        while i < size:
-            if path[i].current_key == key:
-                return path[i]
-            i += 1
-
     def __eq__(self, o: GraphInterface) -> bool:
         if self is o: return True
         return self.Graph.__eq__(o.Graph)
@@ -291,80 +747,358 @@ class GraphAlgo(GraphAlgoInterface):
         return f"GraphAlgo:{self.Graph}"
 
     # --------------------------- algorithms ------------------------ #
-    def dijkstras(self, src: NodeData, dest: NodeData) -> list:
+    def dijkstras(self, src: NodeData, dest: NodeData = None, queue: str = None) -> (dict, dict):
         """
          Dijkstras algorithm - https://en.wikipedia.org/wiki/Dijkstra%27s_algorithm
+        the search stops as soon as dest is settled, if dest is None the search runs over
+        every vertex that is reachable from src
         :param src: the source of the path
         :param dest:the destination of the path
-        :return: list of weight and  path
-        """
-        short_path = []
-        visited = {int: int}
-        dist_and_path = [0.0, [int]]
-        heap_priority = []
-        sub_node = GraphAlgo.SubNode(src.key, src.key, 0.0)  # create subnode for the src
-        heapq.heappush(heap_priority, (0.0, sub_node))  # add the src to the heap
+        :param queue: "heapq" - a vertex is pushed again every time its distance is lowered and the stale
+                      entries are skipped, "indexed" - IndexedHeap with decrease-key, at most V entries and
+                      ties broken by the smaller key, "buckets" - Dial's buckets (see _dijkstras_buckets),
+                      falls back to "heapq" when the weights do not allow it, None - "buckets" when the
+                      weight range of the graph allows it else "heapq" (the CSRGraph search always uses heapq)
+        :return: (dist, parent) - dist maps each settled vertex to its distance from src,
+                 parent maps each settled vertex to the previous vertex on its path (None for src)
+        """
+        if isinstance(self.Graph, CSRGraph):
+            return self._dijkstras_csr(src.key, dest.key if dest is not None else None)
+        if queue is None or queue == "buckets":
+            low, high = self.Graph.weight_range() if hasattr(self.Graph, "weight_range") else (0.0, 0.0)
+            if 0 < low and high <= low * self.bucket_limit:
+                return self._dijkstras_buckets(src.key, dest.key if dest is not None else None, low, high)
+            queue = "heapq"
+        if queue == "indexed":
+            return self._dijkstras_indexed(src.key, dest.key if dest is not None else None)
+        if queue != "heapq":
+            raise ValueError(f"unknown queue: {queue}")
+        dist = {}
+        parent = {}
+        dest_key = dest.key if dest is not None else None
+        for current_key, weight in self._settle(src.key, dist, parent):
+            if current_key == dest_key:  # the path has found
+                break
+        return dist, parent
+
+    def _settle(self, src: int, dist: dict, parent: dict):
+        """
+        the core of Dijkstra's algorithm with heapq as a generator - the vertices are settled one at a time
+        when the caller asks for the next one, so the caller decides when to stop. the edges of a vertex
+        are relaxed only after it was handed out, a caller that stops on a vertex never expands it
+        :param src: the key of the source
+        :param dist: empty dictionary, filled with the distance of each settled vertex
+        :param parent: empty dictionary, filled with the previous vertex on the path of each settled vertex
+        :return: generator of (vertex key, distance) in increasing distance, equal distances by the smaller key
+        """
+        tentative = {src: 0.0}  # best distance found so far for each discovered vertex
+        heap_priority = [(0.0, src, None)]  # (weight, vertex, parent)
         while len(heap_priority) != 0:
-            p_sub_node = heapq.heappop(heap_priority)[1]  # get and remove the subnode with the lowest weight
-            current_key = p_sub_node.current_key
-            if dest.key == current_key:  # the path has found
-                short_path.append(p_sub_node)
-                return [p_sub_node.weight, short_path]
-            if current_key not in visited:  # this vertex is not visited
-                visited[current_key] = 1  # mark him as visited
-                short_path.append(p_sub_node)  # add him to the path
-                dist_and_path[0] += p_sub_node.weight  # add the weight
-                for p_edge in self.Graph.all_out_edges_of_node(current_key):  # all this node  out neighbors
-                    if p_edge not in visited:
-                        p_dest = GraphAlgo.SubNode(current_key, p_edge)
-                        smallest_weight = p_sub_node.weight + self.get_graph().get_edge(current_key, p_edge).weight
-                        if smallest_weight < p_dest.weight:
-                            p_dest.weight = smallest_weight
-                            heapq.heappush(heap_priority, (p_dest.weight, p_dest))  # add the tuple to the heap
-                            # Note: the heap compare the weight of the vertex
-                            dist_and_path[0] += p_dest.weight
-        dist_and_path[1] = short_path
-        return dist_and_path
+            weight, current_key, parent_key = heapq.heappop(heap_priority)  # the vertex with the lowest weight
+            if current_key in dist:  # stale entry, this vertex is already settled
+                continue
+            dist[current_key] = weight  # mark him as settled
+            parent[current_key] = parent_key
+            yield current_key, weight
+            for p_edge, w in self.Graph.out_arcs(current_key):  # all this node  out neighbors (no edge lookup)
+                if p_edge not in dist:
+                    smallest_weight = weight + w
+                    if smallest_weight < tentative.get(p_edge, math.inf):
+                        tentative[p_edge] = smallest_weight
+                        heapq.heappush(heap_priority, (smallest_weight, p_edge, current_key))
+
+    def _dijkstras_indexed(self, src: int, dest: int = None) -> (dict, dict):
+        """
+        Dijkstra's algorithm over an IndexedHeap - a relaxation lowers the priority of the vertex in place
+        instead of pushing a new tuple, so nothing is allocated per edge and the heap holds at most V vertices
+        :param src: the key of the source
+        :param dest: the key of the destination, None to run over every reachable vertex
+        :return: (dist, parent) the same as dijkstras
+        """
+        graph = self.Graph
+        dist = {}
+        parent = {}
+        parent_of = {src: None}  # the parent of each vertex in the heap
+        heap = IndexedHeap()
+        heap.push(src, 0.0)
+        while heap.heap:
+            weight, current_key = heap.pop()
+            dist[current_key] = weight
+            parent[current_key] = parent_of.pop(current_key)
+            if current_key == dest:  # the path has found
+                break
+            for p_edge, w in graph.out_arcs(current_key):
+                if p_edge not in dist and heap.push(p_edge, weight + w):
+                    parent_of[p_edge] = current_key
+        return dist, parent
+
+    def _dijkstras_buckets(self, src: int, dest: int, width: float, high: float) -> (dict, dict):
+        """
+        Dial's algorithm - Dijkstra's algorithm over buckets of distances instead of a heap, the bucket of a
+        vertex is its distance // width. since width is not larger than any edge weight, a vertex can not lower
+        the distance of another vertex of its own bucket, so every vertex of the lowest bucket is settled as it
+        is taken out, in O(1). a relaxation appends (distance, vertex) to the bucket of the distance, an entry whose
+        distance is not the best one of its vertex anymore is skipped later (the bucket is never computed again, a
+        rounded quotient could put it elsewhere). the distances are at most high ahead of the current bucket,
+        a ring of high // width + 3 buckets leaves a spare bucket for the rounding of the quotients.
+        the numbers of the non empty buckets are kept in a small heap, the next bucket is popped from it instead
+        of scanning the empty buckets in between (on a long path of wide weights almost every bucket is empty)
+        :param src: the key of the source
+        :param dest: the key of the destination, None to run over every reachable vertex
+        :param width: the width of a bucket, not larger than the min edge weight
+        :param high: the max edge weight
+        :return: (dist, parent) the same as dijkstras
+        """
+        graph = self.Graph
+        size = int(high / width) + 3
+        buckets = [[] for i in range(size)]
+        dist = {}
+        parent = {}
+        tentative = {src: 0.0}  # best distance found so far for each discovered vertex
+        parent_of = {src: None}
+        buckets[0].append((0.0, src))
+        nonempty = [0]  # the numbers of the buckets that got an entry while they were empty
+        while nonempty:
+            b = heapq.heappop(nonempty)  # the current bucket
+            bucket = buckets[b % size]
+            while bucket:
+                weight, current_key = bucket.pop()
+                if current_key in dist:  # stale entry, this vertex is already settled
+                    continue
+                if weight != tentative[current_key]:  # stale entry, the vertex got a shorter distance since
+                    continue
+                dist[current_key] = weight
+                parent[current_key] = parent_of[current_key]
+                if current_key == dest:  # the path has found
+                    return dist, parent
+                for p_edge, w in graph.out_arcs(current_key):
+                    if p_edge not in dist:
+                        smallest_weight = weight + w
+                        if smallest_weight < tentative.get(p_edge, math.inf):
+                            tentative[p_edge] = smallest_weight
+                            parent_of[p_edge] = current_key
+                            nb = int(smallest_weight / width)
+                            target = buckets[nb % size]
+                            if not target:
+                                heapq.heappush(nonempty, nb)
+                            target.append((smallest_weight, p_edge))
+        return dist, parent
+
+    def _dijkstras_csr(self, src: int, dest: int = None) -> (dict, dict):
+        """
+        Dijkstra's algorithm over the flat arrays of a CSRGraph, the vertices are handled by their index
+        and only the settled ones are translated back to keys
+        :param src: the key of the source
+        :param dest: the key of the destination, None to run over every reachable vertex
+        :return: (dist, parent) the same as dijkstras
+        """
+        graph = self.Graph
+        keys, offsets, targets, weights = graph.keys, graph.out_offsets, graph.out_targets, graph.out_weights
+        n = len(keys)
+        s = graph.index[src]
+        t = graph.index[dest] if dest is not None else -1
+        tentative = array('d', [math.inf]) * n
+        parent_index = array('q', [-1]) * n
+        settled = bytearray(n)
+        dist = {}
+        parent = {}
+        tentative[s] = 0.0
+        heap_priority = [(0.0, s)]
+        while heap_priority:
+            weight, v = heapq.heappop(heap_priority)
+            if settled[v]:  # stale entry
+                continue
+            settled[v] = 1
+            p = parent_index[v]
+            dist[keys[v]] = weight
+            parent[keys[v]] = keys[p] if p != -1 else None
+            if v == t:  # the path has found
+                break
+            for e in range(offsets[v], offsets[v + 1]):
+                u = targets[e]
+                if not settled[u]:
+                    smallest_weight = weight + weights[e]
+                    if smallest_weight < tentative[u]:
+                        tentative[u] = smallest_weight
+                        parent_index[u] = v
+                        heapq.heappush(heap_priority, (smallest_weight, u))
+        return dist, parent
+
+    def bidirectional_dijkstras(self, src: int, dest: int) -> (float, list):
+        """
+        bidirectional Dijkstra's algorithm - a forward search from src over the out edges and a backward
+        search from dest over the in edges, the side with the smaller queue head is expanded each step.
+        every edge relaxed towards a vertex the other side has reached gives a candidate path,
+        the search stops once the two queue heads together are not smaller than the best candidate
+        :param src: the key of the source
+        :param dest: the key of the destination
+        :return: the weight of the path and the list of the vertices on it, (inf, []) if there is no path
+        """
+        if src == dest:
+            return (0.0, [src])
+        graph = self.Graph
+        dist = ({src: 0.0}, {dest: 0.0})  # forward, backward
+        parent = ({src: None}, {dest: None})
+        settled = (set(), set())
+        heaps = ([(0.0, src)], [(0.0, dest)])
+        arcs = (graph.out_arcs, graph.in_arcs)
+        best, meet = math.inf, None
+        while heaps[0] and heaps[1]:
+            if heaps[0][0][0] + heaps[1][0][0] >= best:  # no shorter path can be found
+                break
+            side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+            weight, current_key = heapq.heappop(heaps[side])
+            if current_key in settled[side]:  # stale entry
+                continue
+            settled[side].add(current_key)
+            my_dist, my_parent, other_dist = dist[side], parent[side], dist[1 - side]
+            for neighbor, w in arcs[side](current_key):
+                smallest_weight = weight + w
+                if smallest_weight < my_dist.get(neighbor, math.inf):
+                    my_dist[neighbor] = smallest_weight
+                    my_parent[neighbor] = current_key
+                    heapq.heappush(heaps[side], (smallest_weight, neighbor))
+                if neighbor in other_dist and my_dist[neighbor] + other_dist[neighbor] < best:
+                    best = my_dist[neighbor] + other_dist[neighbor]
+                    meet = neighbor
+        if meet is None:
+            return (float('inf'), [])
+        path = []
+        key = meet
+        while key is not None:  # src ... meet
+            path.append(key)
+            key = parent[0][key]
+        path.reverse()
+        key = parent[1][meet]
+        while key is not None:  # meet ... dest
+            path.append(key)
+            key = parent[1][key]
+        return (best, path)
+
+    def astar_scale(self) -> float:
+        """
+        the A* heuristic of a vertex is its euclidean distance to the destination times this scale,
+        the scale is the lowest weight per distance unit over all the edges, so no edge is cheaper than
+        the heuristic difference of its ends - the heuristic is consistent (and admissible).
+        the scale is computed once per mode count of the graph
+        :return: the scale, 0 if some node has no position or there is no edge with a length
+        """
+        cache = self._cache()
+        scale = cache.get("astar_scale")
+        if scale is None:
+            scale = math.inf
+            nodes = self.Graph.get_all_v()
+            for key, node in nodes.items():
+                if node.pos is None or not all(math.isfinite(c) for c in node.pos):
+                    scale = 0.0  # the heuristic can not be computed
+                    break
+                for dest, weight in self.Graph.out_arcs(key):
+                    length = math.dist(node.pos, nodes[dest].pos) if nodes[dest].pos is not None else 0.0
+                    if length > 0:
+                        scale = min(scale, weight / length)
+            scale = scale * (1 - 1e-9) if math.isfinite(scale) else 0.0  # keep the bound safe from rounding
+            cache.put("astar_scale", scale)
+        return scale
+
+    def astar(self, src: int, dest: int, heuristic) -> (float, list):
+        """
+        A* search - https://en.wikipedia.org/wiki/A*_search_algorithm
+        the queue is ordered by the distance from src plus the heuristic of the vertex,
+        the heuristic must be consistent (never more than an edge weight plus the heuristic of its end)
+        :param src: the key of the source
+        :param dest: the key of the destination
+        :param heuristic: function vertex key -> lower bound of its distance to dest (inf if it can not reach dest)
+        :return: the weight of the path and the list of the vertices on it, (inf, []) if there is no path
+        """
+        dist = {src: 0.0}
+        parent = {src: None}
+        settled = set()
+        heap_priority = [(heuristic(src), 0.0, src)]  # (estimate, weight, vertex)
+        while heap_priority:
+            estimate, weight, current_key = heapq.heappop(heap_priority)
+            if current_key in settled:  # stale entry
+                continue
+            settled.add(current_key)
+            if current_key == dest:  # the path has found
+                return ShortestPathTree(src, dist, parent).path(dest)
+            for neighbor, w in self.Graph.out_arcs(current_key):
+                smallest_weight = weight + w
+                if neighbor not in settled and smallest_weight < dist.get(neighbor, math.inf):
+                    h = heuristic(neighbor)
+                    if h == math.inf:  # neighbor can not reach dest
+                        continue
+                    dist[neighbor] = smallest_weight
+                    parent[neighbor] = current_key
+                    heapq.heappush(heap_priority, (smallest_weight + h, smallest_weight, neighbor))
+        return (float('inf'), [])
+
+    def _distances(self, src: int, reverse: bool = False) -> dict:
+        """
+        plain Dijkstra's algorithm over the whole graph
+        :param src: the key of the source
+        :param reverse: if true the in edges are followed, so the result is the distance from each vertex to src
+        :return: dictionary vertex key -> distance, only the reachable vertices
+        """
+        arcs = self.Graph.in_arcs if reverse else self.Graph.out_arcs
+        dist = {}
+        tentative = {src: 0.0}
+        heap_priority = [(0.0, src)]
+        while heap_priority:
+            weight, current_key = heapq.heappop(heap_priority)
+            if current_key in dist:  # stale entry
+                continue
+            dist[current_key] = weight
+            for neighbor, w in arcs(current_key):
+                if neighbor not in dist and weight + w < tentative.get(neighbor, math.inf):
+                    tentative[neighbor] = weight + w
+                    heapq.heappush(heap_priority, (weight + w, neighbor))
+        return dist
 
     # this is the recursive trajan algorithm implementation that first firstly used
     # unfortunately this version does not support large graphs in python due to stackoverflow of recursive calls
     # therefore we had to implement an iterative version of it
-    def find_sc(self, vertex: NodeData, stack: deque, hashmap: {}, graph: GraphInterface):
+    def find_sc(self, vertex: NodeData, stack: deque, hashmap: {}, graph: GraphInterface,
+                index: dict = None, lowlink: dict = None, on_stack: set = None):
         """
         Trajan's algorithm - https://en.wikipedia.org/wiki/Tarjan%27s_strongly_connected_components_algorithm
         :param vertex: NodeData
         :param stack: deque()
         :param hashmap: dictionary
         :param graph: DiGraph
+        :param index: dictionary node key -> dfs index (the algorithm state, created on the first call)
+        :param lowlink: dictionary node key -> lowlink
+        :param on_stack: set of the keys of the nodes on the stack
         :return: void
         function will manipulate the given hashmap so that each value is a list of nodes in the same
         strongly connected component represented by the key
         """
+        if index is None:
+            index, lowlink, on_stack = {}, {}, set()
         stack.append(vertex)
-        vertex.visited = True
-        vertex.w = self.staticNum
-        vertex.t = self.staticNum
+        on_stack.add(vertex.key)
+        index[vertex.key] = self.staticNum
+        lowlink[vertex.key] = self.staticNum
         self.staticNum += 1
         for key, curr_node in self.get_graph().all_out_edges_of_node(vertex.key).items():
-            if curr_node.w == -1:
-                self.find_sc(curr_node, stack, hashmap, graph)
-                vertex.t = (min(vertex.t, curr_node.t))
-            elif curr_node.visited:
-                vertex.t = (min(vertex.t, curr_node.w))
+            if key not in index:
+                self.find_sc(curr_node, stack, hashmap, graph, index, lowlink, on_stack)
+                lowlink[vertex.key] = min(lowlink[vertex.key], lowlink[key])
+            elif key in on_stack:
+                lowlink[vertex.key] = min(lowlink[vertex.key], index[key])
 
         tmp = -1
-        if vertex.t == vertex.w:
+        if lowlink[vertex.key] == index[vertex.key]:
+            root = lowlink[vertex.key]
             while tmp != vertex.key:
                 node = stack.pop()
                 tmp = node.key
-                if vertex.t not in hashmap:
-                    hashmap[vertex.t] = []
-                    hashmap[vertex.t].append(node)
+                if root not in hashmap:
+                    hashmap[root] = []
+                    hashmap[root].append(node)
                 else:
-                    hashmap[vertex.t].append(node)
-
-                node.visited = False
+                    hashmap[root].append(node)
 
+                on_stack.discard(node.key)
 
     def Trajans(self) -> [[]]:
         """
@@ -373,54 +1107,188 @@ class GraphAlgo(GraphAlgoInterface):
         -------
 
         """
-        ed = {}
-        for n in self.get_graph().get_all_v().keys():
-            ed[n] = self.SubNode(-1, -1, -1, n)
+        return self._trajans_arrays(*self._out_arrays())
 
-        for n in self.get_graph().get_all_v().keys():
-            for neigh in self.get_graph().all_out_edges_of_node(n).keys():
-                ed[n].adj.append(ed[neigh])
-        vs = ed.values()
-        i = 0
+    def _out_arrays(self) -> (list, array, array):
+        """
+        :return: (keys, offsets, targets) - the out edges of the graph by vertex index in CSR form,
+                 the arrays of a CSRGraph as they are, built in one pass for a DiGraph
+                 (node order and edge order are kept, so is the order of the SCC results)
+        """
+        graph = self.Graph
+        if isinstance(graph, CSRGraph):
+            return graph.keys, graph.out_offsets, graph.out_targets
+        keys = list(graph.get_all_v())
+        index = {key: i for i, key in enumerate(keys)}
+        out = graph.all_out_edges_of_node
+        offsets = array('q', [0])
+        offsets.extend(accumulate(len(out(key)) for key in keys))
+        targets = array('q', [index[dest] for key in keys for dest in out(key)])
+        return keys, offsets, targets
+
+    def kosaraju(self) -> [[]]:
+        """
+        iterative Kosaraju's algorithm - https://en.wikipedia.org/wiki/Kosaraju%27s_algorithm
+        a dfs over the out edges (src_to_dest) orders the nodes by finish time, a second pass over the in edges
+        (dest_to_src) from the last finished node collects one component at a time
+        Returns list(list()) including all the Strongly connected component (in topological order)
+        """
+        graph = self.Graph
+        out, inn = graph.all_out_edges_of_node, graph.all_in_edges_of_node
+        finished = []
+        seen = set()
+        for root in graph.get_all_v():
+            if root in seen:
+                continue
+            seen.add(root)
+            call_stack = [(root, iter(out(root)))]
+            while call_stack:
+                v, neighbors = call_stack[-1]
+                for w in neighbors:
+                    if w not in seen:
+                        seen.add(w)
+                        call_stack.append((w, iter(out(w))))
+                        break
+                else:  # all the out neighbors of v are done
+                    call_stack.pop()
+                    finished.append(v)
+        comps = []
+        assigned = set()
+        for root in reversed(finished):
+            if root in assigned:
+                continue
+            assigned.add(root)
+            comp = [root]
+            stack = [root]
+            while stack:
+                for w in inn(stack.pop()):
+                    if w not in assigned:
+                        assigned.add(w)
+                        comp.append(w)
+                        stack.append(w)
+            comps.append(comp)
+        return comps
+
+    @staticmethod
+    def _path_based(keys, offsets, targets) -> [[]]:
+        """
+        iterative path-based (Gabow's) algorithm - https://en.wikipedia.org/wiki/Path-based_strong_component_algorithm
+        over flat CSR arrays, instead of lowlinks it keeps a second stack with the preorder numbers of the roots
+        of the components that are not done yet
+        :param keys: the key of each vertex by its index
+        :param offsets: n+1 offsets into targets
+        :param targets: index of the destination of each out edge
+        Returns list(list()) including all the Strongly connected component (same order as Trajans)
+        """
+        n = len(keys)
+        preorder = array('q', [-1]) * n
+        done = bytearray(n)  # the vertex is in a component already
+        next_edge = array('q', offsets)
+        stack = []  # the vertices that are not in a component yet
+        roots = []  # preorder numbers of the possible component roots
+        call_stack = []
+        comps = []
+        c = 0
+        for root in range(n):
+            if preorder[root] != -1:
+                continue
+            preorder[root] = c
+            c += 1
+            stack.append(root)
+            roots.append(preorder[root])
+            call_stack.append(root)
+            while call_stack:
+                v = call_stack[-1]
+                e, end = next_edge[v], offsets[v + 1]
+                recurse = -1
+                while e < end:
+                    w = targets[e]
+                    e += 1
+                    if preorder[w] == -1:
+                        recurse = w
+                        break
+                    if not done[w]:  # w is on the path - everything after it is one component
+                        while roots[-1] > preorder[w]:
+                            roots.pop()
+                next_edge[v] = e
+                if recurse != -1:
+                    preorder[recurse] = c
+                    c += 1
+                    stack.append(recurse)
+                    roots.append(preorder[recurse])
+                    call_stack.append(recurse)
+                    continue
+                call_stack.pop()
+                if roots[-1] == preorder[v]:  # v is the root of a component
+                    roots.pop()
+                    comp = []
+                    while True:
+                        w = stack.pop()
+                        done[w] = 1
+                        comp.append(keys[w])
+                        if w == v:
+                            break
+                    comps.append(comp)
+        return comps
+
+    @staticmethod
+    def _trajans_arrays(keys, offsets, targets) -> [[]]:
+        """
+        iterative trajan's algorithm over flat CSR arrays, index/lowlink/on-stack are
+        kept in arrays by vertex index and the dfs call stack holds only vertex indexes,
+        the position of the next edge to scan of each vertex is kept in its own array
+        :param keys: the key of each vertex by its index
+        :param offsets: n+1 offsets into targets
+        :param targets: index of the destination of each out edge
+        Returns list(list()) including all the Strongly connected component
+        """
+        n = len(keys)
+        index = array('q', [-1]) * n
+        lowlink = array('q', [0]) * n
+        on_stack = bytearray(n)
+        next_edge = array('q', offsets)  # the next out edge to scan of each vertex
         stack = []
         call_stack = []
         comps = []
-        for v in vs:
-            if v.index is None:
-                call_stack.append((v, 0))
-                while call_stack:
-                    v, pi = call_stack.pop()
-                    # If this is first time we see v
-                    if pi == 0:
-                        v.index = i
-                        v.lowlink = i
-                        i += 1
-                        stack.append(v)
-                        v.on_stack = True
-                    # If we just backtracked on something
-                    if pi > 0:
-                        prev = v.adj[pi - 1]
-                        v.lowlink = min(v.lowlink, prev.lowlink)
-                    # Find the next thing to recurse on
-                    while pi < len(v.adj) and v.adj[pi].index is not None:
-                        w = v.adj[pi]
-                        if w.on_stack:
-                            v.lowlink = min(v.lowlink, w.index)
-                        pi += 1
-                    # If we found something with index=None, recurse
-                    if pi < len(v.adj):
-                        w = v.adj[pi]
-                        call_stack.append((v, pi + 1))
-                        call_stack.append((w, 0))
-                        continue
-                    # If v is the root of a connected component
-                    if v.lowlink == v.index:
-                        comp = []
-                        while True:
-                            w = stack.pop()
-                            w.on_stack = False
-                            comp.append(w.name)
-                            if w is v:
-                                break
-                        comps.append(comp)
-        return comps
\ No newline at end of file
+        i = 0
+        for root in range(n):
+            if index[root] != -1:
+                continue
+            index[root] = lowlink[root] = i
+            i += 1
+            stack.append(root)
+            on_stack[root] = 1
+            call_stack.append(root)
+            while call_stack:
+                v = call_stack[-1]
+                e, end = next_edge[v], offsets[v + 1]
+                recurse = -1
+                while e < end:  # find the next thing to recurse on
+                    w = targets[e]
+                    e += 1
+                    if index[w] == -1:
+                        recurse = w
+                        break
+                    if on_stack[w] and index[w] < lowlink[v]:
+                        lowlink[v] = index[w]
+                next_edge[v] = e
+                if recurse != -1:  # first time we see w
+                    index[recurse] = lowlink[recurse] = i
+                    i += 1
+                    stack.append(recurse)
+                    on_stack[recurse] = 1
+                    call_stack.append(recurse)
+                    continue
+                call_stack.pop()  # v is done, backtrack to its parent
+                if call_stack and lowlink[v] < lowlink[call_stack[-1]]:
+                    lowlink[call_stack[-1]] = lowlink[v]
+                if lowlink[v] == index[v]:  # v is the root of a connected component
+                    comp = []
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = 0
+                        comp.append(keys[w])
+                        if w == v:
+                            break
+                    comps.append(comp)
+        return comps
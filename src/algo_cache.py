@@ -0,0 +1,76 @@
+from collections import OrderedDict
+
+from src import GraphInterface
+
+
+class AlgoCache:
+    """
+    This class represent a bounded LRU cache of algorithm results (shortest path trees, SCCs..)
+    the results are valid only for one graph at one mode count, once the graph changes
+    (or GraphAlgo starts working on another graph) all the entries are dropped
+    """
+
+    def __init__(self, capacity: int = 16):
+        """
+        :param capacity: the max number of results kept, the least recently used one is evicted first
+        """
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.graph = None  # the graph the entries were computed on
+        self.mc = None  # the mode count of that graph when the entries were computed
+        self.hits = 0
+        self.misses = 0
+
+    def validate(self, graph: GraphInterface) -> None:
+        """
+        drop all the entries if the graph is not the one they were computed on or it was changed since
+        :param graph: the graph GraphAlgo currently works on
+        """
+        mc = graph.get_mc() if graph is not None else None
+        if graph is not self.graph or mc != self.mc:
+            self.entries.clear()
+            self.graph = graph
+            self.mc = mc
+
+    def get(self, key, usable=None):
+        """
+        return the cached value of key and mark it as the most recently used one
+        :param key: the key of the result, for example ("sp", src)
+        :param usable: optional predicate, a cached value that does not satisfy it counts as a miss
+        :return: the cached value, None on a miss
+        """
+        value = self.entries.get(key)
+        if value is None or (usable is not None and not usable(value)):
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value) -> None:
+        """
+        add (or replace) a value, evict the least recently used entries if the cache is full
+        :param key: the key of the result
+        :param value: the result
+        """
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.graph = None
+        self.mc = None
+
+    def info(self) -> dict:
+        """
+        :return: dictionary with the hits, misses, current size and capacity of the cache
+        """
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.entries), "capacity": self.capacity}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __repr__(self):
+        return f"AlgoCache[hits:{self.hits},misses:{self.misses},size:{len(self.entries)}/{self.capacity}]"
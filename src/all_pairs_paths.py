@@ -0,0 +1,147 @@
+import math
+
+import numpy as np
+
+from src.batch_search import bounded_search
+from src.CSRGraph import CSRGraph
+
+
+class AllPairsPaths:
+    """
+    This class represent the result of an all pairs shortest paths run:
+    dist[i][j] is the weight of the shortest path from the vertex of index i to the vertex of index j,
+    next_hop[i][j] is the index of the vertex after i on that path (-1 if there is no path),
+    so every path can be recovered in O(path length) from the two matrices
+    """
+
+    def __init__(self, keys: np.ndarray, dist: np.ndarray, next_hop: np.ndarray, fingerprint: int):
+        """
+        :param keys: the key of each vertex by its index
+        :param dist: n x n distances matrix
+        :param next_hop: n x n next hop matrix
+        :param fingerprint: the fingerprint of the graph the result was computed on (CSRGraph.fingerprint)
+        """
+        self.keys = keys
+        self.dist = dist
+        self.next_hop = next_hop
+        self.fingerprint = fingerprint
+        self.index = {int(key): i for i, key in enumerate(keys)}
+
+    @staticmethod
+    def _hop_type(n: int):
+        """
+        :return: the smallest signed integer type that holds the vertex indices (and -1)
+        """
+        return np.int16 if n < 2 ** 15 else np.int32
+
+    @classmethod
+    def floyd_warshall(cls, graph: CSRGraph) -> 'AllPairsPaths':
+        """
+        Floyd-Warshall algorithm - https://en.wikipedia.org/wiki/Floyd%E2%80%93Warshall_algorithm
+        vectorized over whole rows: the k-th step relaxes the entire matrix through vertex k at once,
+        O(n^3) work but done by numpy, the best choice for dense graphs
+        :param graph: CSRGraph
+        :return: AllPairsPaths of the graph
+        """
+        n = len(graph.keys)
+        dist = np.full((n, n), math.inf)
+        next_hop = np.full((n, n), -1, dtype=cls._hop_type(n))
+        rows = np.repeat(np.arange(n), np.diff(np.frombuffer(graph.out_offsets, dtype=np.int64)))
+        cols = np.frombuffer(graph.out_targets, dtype=np.int64)
+        dist[rows, cols] = np.frombuffer(graph.out_weights, dtype=np.float64)
+        next_hop[rows, cols] = cols
+        np.fill_diagonal(dist, 0.0)
+        np.fill_diagonal(next_hop, np.arange(n))
+        for k in range(n):
+            through_k = dist[:, k, None] + dist[None, k, :]
+            shorter = through_k < dist
+            np.copyto(dist, through_k, where=shorter)
+            np.copyto(next_hop, np.broadcast_to(next_hop[:, k, None], (n, n)), where=shorter)
+        return cls(np.frombuffer(graph.keys, dtype=np.int64).copy(), dist, next_hop, graph.fingerprint())
+
+    @classmethod
+    def repeated_dijkstra(cls, graph: CSRGraph) -> 'AllPairsPaths':
+        """
+        one full Dijkstra's search from every vertex, O(n * m log n) - the best choice for sparse graphs.
+        the next hop towards every vertex is the first vertex of its path in the search tree
+        :param graph: CSRGraph
+        :return: AllPairsPaths of the graph
+        """
+        n = len(graph.keys)
+        dist = np.empty((n, n))
+        next_hop = np.empty((n, n), dtype=cls._hop_type(n))
+        every = range(n)
+        for s in every:
+            tentative, parent = bounded_search(graph, s, every)
+            first = [-1] * n  # the first hop of each vertex
+            first[s] = s
+            for v in every:
+                if first[v] != -1 or tentative[v] == math.inf:
+                    continue
+                chain = []
+                u = v
+                while first[u] == -1 and parent[u] != s:
+                    chain.append(u)
+                    u = parent[u]
+                if first[u] == -1:  # u is an out neighbor of s
+                    first[u] = u
+                for c in chain:
+                    first[c] = first[u]
+            dist[s] = tentative
+            next_hop[s] = first
+        return cls(np.frombuffer(graph.keys, dtype=np.int64).copy(), dist, next_hop, graph.fingerprint())
+
+    def is_valid_for(self, graph) -> bool:
+        """
+        :param graph: GraphInterface
+        :return: true if the result was computed on a graph with the same content as this graph has now
+                 (the mode count is not compared, it is the same for every graph loaded from json)
+        """
+        return graph is not None and CSRGraph.fingerprint_of(graph) == self.fingerprint
+
+    def distance(self, src: int, dest: int) -> float:
+        """
+        :return: the weight of the shortest path from src to dest, inf if there is no path
+        """
+        if src not in self.index or dest not in self.index:
+            return math.inf
+        return float(self.dist[self.index[src], self.index[dest]])
+
+    def path(self, src: int, dest: int) -> (float, list):
+        """
+        follow the next hops from src to dest
+        :return: (distance, list of the nodes on the path), (inf, []) if there is no path
+        """
+        d = self.distance(src, dest)
+        if d == math.inf:
+            return (float('inf'), [])
+        i, j = self.index[src], self.index[dest]
+        path = [src]
+        while i != j:
+            i = int(self.next_hop[i, j])
+            path.append(int(self.keys[i]))
+        return (d, path)
+
+    def save(self, file_name: str) -> None:
+        """
+        save both matrices (and the vertex keys) into a numpy .npz file
+        :param file_name: the path of the file
+        """
+        with open(file_name, "wb") as file:
+            np.savez(file, keys=self.keys, dist=self.dist, next_hop=self.next_hop,
+                     meta=np.array([self.fingerprint], dtype=np.int64))
+
+    @classmethod
+    def load(cls, file_name: str) -> 'AllPairsPaths':
+        """
+        :param file_name: the path of a file written by save
+        :return: AllPairsPaths
+        """
+        with np.load(file_name) as data:
+            return cls(data["keys"], data["dist"], data["next_hop"], int(data["meta"][0]))
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __repr__(self):
+        return f"AllPairsPaths[Node_size:{len(self.keys)},fingerprint:{self.fingerprint}]"
@@ -0,0 +1,110 @@
+import heapq
+import math
+from array import array
+
+from src.CSRGraph import CSRGraph
+
+_graph = None  # the graph snapshot of a worker process, set once by init_worker
+
+
+def bounded_search(graph: CSRGraph, s: int, wanted: set) -> (array, array):
+    """
+    Dijkstra's algorithm from the vertex index s over the flat arrays of the graph,
+    the search stops as soon as all the wanted vertex indices are settled
+    :return: (tentative, parent) arrays by vertex index, the entries of the wanted vertices are final
+    """
+    offsets, out_targets, weights = graph.out_offsets, graph.out_targets, graph.out_weights
+    n = len(graph.keys)
+    tentative = array('d', [math.inf]) * n
+    parent = array('q', [-1]) * n
+    settled = bytearray(n)
+    remaining = len(wanted)
+    tentative[s] = 0.0
+    heap_priority = [(0.0, s)]
+    while heap_priority and remaining:
+        weight, v = heapq.heappop(heap_priority)
+        if settled[v]:  # stale entry
+            continue
+        settled[v] = 1
+        if v in wanted:
+            remaining -= 1
+        for e in range(offsets[v], offsets[v + 1]):
+            u = out_targets[e]
+            if not settled[u]:
+                smallest_weight = weight + weights[e]
+                if smallest_weight < tentative[u]:
+                    tentative[u] = smallest_weight
+                    parent[u] = v
+                    heapq.heappush(heap_priority, (smallest_weight, u))
+    return tentative, parent
+
+
+def bounded_distances(graph: CSRGraph, src: int, targets: list) -> list:
+    """
+    one search from src that stops as soon as all the targets are settled
+    :param graph: CSRGraph
+    :param src: the key of the source
+    :param targets: the keys of the targets
+    :return: the distance of each target from src (in the order of targets), inf if it is not reachable
+    """
+    index = graph.index
+    if src not in index:
+        return [math.inf] * len(targets)
+    wanted = {index[key] for key in targets if key in index}
+    tentative, parent = bounded_search(graph, index[src], wanted)
+    return [tentative[index[key]] if key in index else math.inf for key in targets]
+
+
+def bounded_paths(graph: CSRGraph, src: int, targets: list) -> list:
+    """
+    the same as bounded_distances but the paths are returned too
+    :return: (distance, list of the keys on the path) for each target, (inf, []) if it is not reachable
+    """
+    index, keys = graph.index, graph.keys
+    if src not in index:
+        return [(float('inf'), []) for key in targets]
+    wanted = {index[key] for key in targets if key in index}
+    tentative, parent = bounded_search(graph, index[src], wanted)
+    result = []
+    for key in targets:
+        if key not in index or tentative[index[key]] == math.inf:
+            result.append((float('inf'), []))
+            continue
+        path = []
+        v = index[key]
+        while v != -1:
+            path.append(keys[v])
+            v = parent[v]
+        path.reverse()
+        result.append((tentative[index[key]], path))
+    return result
+
+
+def init_worker(graph) -> None:
+    """
+    process pool initializer, the snapshot is handed to each worker once and not with every task
+    :param graph: the CSRGraph the worker searches on, or the path of a binary snapshot that is memory
+                  mapped by the worker (all the workers then share the same pages of the file)
+    """
+    global _graph
+    _graph = CSRGraph.open_mapped(graph, verify=False) if isinstance(graph, str) else graph
+
+
+def worker_distances(sources: list, targets: list) -> list:
+    """
+    process pool task - bounded_distances of a chunk of sources over the snapshot of the worker
+    :return: list of rows, one for each source
+    """
+    return [bounded_distances(_graph, src, targets) for src in sources]
+
+
+def worker_paths(batch: list) -> list:
+    """
+    process pool task - the paths of a batch of queries grouped by source
+    :param batch: list of (src, positions, targets), positions are the indices of the queries in the input
+    :return: list of (position, (distance, path))
+    """
+    result = []
+    for src, positions, targets in batch:
+        result.extend(zip(positions, bounded_paths(_graph, src, targets)))
+    return result
@@ -0,0 +1,81 @@
+from src import GraphInterface
+from src.DiGraph import DiGraph
+from src.scc_index import SCCIndex
+
+
+class Condensation:
+    """
+    This class represent the condensation of a graph - the DAG of its strongly connected components
+    (every component is one vertex, there is an edge between two components if any of their nodes are connected),
+    with a reachability label for every component: the set of the components it reaches, kept as a bitset
+    (python int) over the topological ranks of the components, shifted down by the rank of the component itself
+    (it reaches only components that come after it) - bit i is the component of rank rank + i, so a label costs
+    as many bits as the distance in ranks to the furthest component it reaches, one bit for a sink.
+    a reaches b iff the label of the component of a has the bit of the component of b,
+    so a query is two dictionary lookups and one bit test - no traversal
+    """
+
+    def __init__(self, graph: GraphInterface, scc: SCCIndex):
+        """
+        build the DAG, a topological order of it (Kahn's algorithm) and the labels (in reverse topological order,
+        the label of a component is its own bit or the labels of its successors, each moved up to its rank)
+        :param graph: the graph
+        :param scc: the strongly connected components of the graph
+        """
+        self.mc = graph.get_mc()
+        self.component_of = dict(scc.component_of)
+        self.edges = {cid: {} for cid in scc.members}  # component id -> {successor id: min edge weight}
+        comp = self.component_of
+        for key in graph.get_all_v():
+            out = self.edges[comp[key]]
+            for dest, weight in graph.out_arcs(key):
+                c = comp[dest]
+                if c != comp[key] and weight < out.get(c, float('inf')):
+                    out[c] = weight
+        in_degree = dict.fromkeys(self.edges, 0)
+        for out in self.edges.values():
+            for c in out:
+                in_degree[c] += 1
+        self.order = [cid for cid, degree in in_degree.items() if degree == 0]  # topological order
+        for cid in self.order:  # the list grows while it is scanned
+            for c in self.edges[cid]:
+                in_degree[c] -= 1
+                if in_degree[c] == 0:
+                    self.order.append(c)
+        self.rank = {cid: r for r, cid in enumerate(self.order)}
+        self.labels = {}
+        rank = self.rank
+        for cid in reversed(self.order):
+            label = 1
+            r = rank[cid]
+            for c in self.edges[cid]:
+                label |= self.labels[c] << (rank[c] - r)
+            self.labels[cid] = label
+
+    def reachable(self, a: int, b: int) -> bool:
+        """
+        :return: true if there is a path from node a to node b (a node always reaches itself)
+        """
+        ca, cb = self.component_of.get(a), self.component_of.get(b)
+        if ca is None or cb is None:
+            return False
+        shift = self.rank[cb] - self.rank[ca]
+        if shift < 0:  # edges only go forward in the topological order
+            return False
+        return (self.labels[ca] >> shift) & 1 == 1
+
+    def to_digraph(self) -> DiGraph:
+        """
+        :return: DiGraph of the DAG, its node keys are the component ids (in topological order) and the weight
+                 of an edge is the lowest weight of the edges between the two components
+        """
+        g = DiGraph()
+        g.add_nodes_from(self.order)
+        g.add_edges_from((cid, c, weight) for cid in self.order for c, weight in self.edges[cid].items())
+        return g
+
+    def __len__(self):
+        return len(self.order)
+
+    def __repr__(self):
+        return f"Condensation[components:{len(self.order)},mc:{self.mc}]"
@@ -2,7 +2,10 @@ class EdgeData:
     """
     This class represent an edge on the graph, each edge has src- the source node
     and dest- the destination node , each edge attached with a weight
+    the class uses __slots__ (no per instance __dict__)
     """
+    __slots__ = ("src", "dest", "weight", "info", "tag")
+
     def __init__(self,source:int,destination:int,we:float,info:str=None,tag:int=-1):
         """
         simple constructor with default data for info and tag,usually used for algorithms
@@ -0,0 +1,180 @@
+import json
+import re
+from array import array
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+def parse_pos(pos) -> tuple or None:
+    """
+    convert the position of a node as it is written in the json files into a 3D tuple
+    :param pos: "x,y,z" string, list of 3 numbers or None
+    :return: tuple of 3 floats, None if the node has no position
+    """
+    if pos is None:
+        return None
+    if isinstance(pos, str):
+        pos = pos.strip("()").split(",")  # string to float
+    return float(pos[0]), float(pos[1]), float(pos[2])
+
+
+class JsonStream:
+    """
+    This class represent a small incremental json reader, the file is read in chunks and only
+    the current chunk is kept in memory, each array item is decoded on its own so a large
+    file is never turned into one big python object
+    """
+
+    def __init__(self, file, chunk_size: int = 1 << 16):
+        """
+        :param file: text file opened for reading
+        :param chunk_size: number of characters read from the file at once
+        """
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        """
+        drop the consumed part of the buffer and read the next chunk
+        :return: false if the end of the file was reached
+        """
+        data = self.file.read(self.chunk_size)
+        if not data:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """
+        :return: the next non whitespace character (not consumed), "" at the end of the file
+        """
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf) or not self._fill():
+                return self.buf[self.pos:self.pos + 1]
+
+    def expect(self, ch: str) -> None:
+        """
+        consume the next non whitespace character, it must be ch
+        """
+        if self.peek() != ch:
+            raise ValueError(f"expected '{ch}' at {self.pos} found '{self.peek()}'")
+        self.pos += 1
+
+    def value(self):
+        """
+        decode the next json value, more chunks are read until the value is complete
+        :return: the decoded value
+        """
+        self.peek()
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buf, self.pos)
+                # a number at the end of the buffer may continue in the next chunk
+                if end < len(self.buf) or self.eof or not self._fill():
+                    self.pos = end
+                    return obj
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+
+    def items(self, sections: tuple):
+        """
+        walk over the top level object and yield the items of the wanted array members one by one,
+        other members are skipped
+        :param sections: the names of the array members to read (for example ("Nodes", "Edges"))
+        :return: generator of (member name, item), nothing for a null document
+        """
+        if self.peek() == "n":  # null - empty graph
+            self.value()
+            return
+        self.expect("{")
+        while self.peek() != "}":
+            name = self.value()
+            self.expect(":")
+            if name in sections and self.peek() == "[":
+                self.pos += 1
+                for item in self._array_items():
+                    yield name, item
+            else:
+                self.value()
+            if self.peek() == ",":
+                self.pos += 1
+
+    def _array_items(self):
+        """
+        yield the items of the array the reader is in and consume its closing bracket,
+        the items of the current chunk are decoded in a tight loop, the chunk is refilled
+        only when an item (or the separator after it) runs past its end
+        :return: generator of the array items
+        """
+        decode = self.decoder.raw_decode
+        skip = _WHITESPACE.match
+        while self.peek() != "]":
+            buf, pos = self.buf, self.pos
+            size = len(buf)
+            while True:
+                try:
+                    obj, end = decode(buf, pos)
+                except json.JSONDecodeError:
+                    break
+                end = skip(buf, end).end()
+                if end >= size:  # the item may be cut, or the separator is in the next chunk
+                    break
+                yield obj
+                if buf[end] == ",":
+                    pos = skip(buf, end + 1).end()
+                    self.pos = pos
+                elif buf[end] == "]":
+                    self.pos = end + 1
+                    return
+                else:
+                    raise ValueError(f"expected ',' or ']' at {end} found '{buf[end]}'")
+            self.pos = pos
+            yield self.value()  # slow path over the end of the chunk
+            if self.peek() == ",":
+                self.pos += 1
+        self.pos += 1
+
+
+def read_graph_json(file_name: str) -> (list, iter):
+    """
+    read a graph json file in one of the two supported formats:
+    {"Nodes":[{"id":0,"pos":"x,y,z"}..],"Edges":[{"src":0,"w":1.2,"dest":1}..]} or
+    {"Nodes":[{"key":0,"pos":[x,y,z]}..],"Edges":[{"src":0,"weight":1.2,"dest":1}..]}
+    the file is streamed item by item and the format of the nodes and of the edges is detected once
+    from their first item, the edges are kept in three flat arrays (the Edges member may come
+    before the Nodes member so they can not be added to a graph while reading), the keys are kept
+    in lists instead once a key that is not an int64 (for example a string id) is read
+    :param file_name: the path of the json
+    :return: list of (node key, pos) and iterator of (src, dest, weight), both empty for an empty graph
+    """
+    nodes = []
+    srcs, dests, weights = array('q'), array('q'), array('d')
+    node_key = None
+    edge_weight = None
+    with open(file_name, "r") as file:
+        for section, k in JsonStream(file).items(("Nodes", "Edges")):
+            if section == "Nodes":
+                if node_key is None:  # the first node tells the format
+                    node_key = "id" if "id" in k else "key"
+                nodes.append((k[node_key], parse_pos(k.get("pos"))))
+            else:
+                if edge_weight is None:  # the first edge tells the format
+                    edge_weight = "w" if "w" in k else "weight"
+                src, dest = k["src"], k["dest"]
+                try:
+                    srcs.append(src)
+                    dests.append(dest)
+                except (TypeError, OverflowError):  # the keys are not int64, keep them in lists from here on
+                    srcs, dests = list(srcs[:len(dests)]), list(dests)
+                    srcs.append(src)
+                    dests.append(dest)
+                weights.append(k[edge_weight])
+    return nodes, zip(srcs, dests, weights)
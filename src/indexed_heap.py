@@ -0,0 +1,98 @@
+class IndexedHeap:
+    """
+    This class represent an indexed binary min heap of integer items (node keys or vertex indices) with decrease-key:
+    every item is in the heap at most once, so the heap never holds more than V items and no stale entries
+    are pushed and skipped like with heapq. the heap itself is a list of items, the priority of each item and its
+    position in the list are kept in dictionaries - nothing is allocated when an item is pushed or decreased.
+    items with equal priorities come out by their smaller key first, so the order is deterministic
+    """
+
+    def __init__(self):
+        self.heap = []  # the items, heap[0] has the lowest priority
+        self.priority = {}  # item -> its priority
+        self.position = {}  # item -> its index in heap
+
+    def push(self, item: int, priority: float) -> bool:
+        """
+        add item to the heap, or lower its priority if it is already there
+        :return: true if the item was added or its priority was lowered, false if it already had a lower one
+        """
+        pos = self.position.get(item)
+        if pos is None:
+            pos = len(self.heap)
+            self.heap.append(item)
+        elif priority >= self.priority[item]:
+            return False
+        self.priority[item] = priority
+        self._sift_up(pos, item, priority)
+        return True
+
+    def pop(self) -> (float, int):
+        """
+        remove the item with the lowest priority (the smallest key among equal priorities)
+        :return: (priority, item)
+        """
+        heap, priority, position = self.heap, self.priority, self.position
+        top = heap[0]
+        last = heap.pop()
+        del position[top]
+        if heap:
+            self._sift_down(0, last, priority[last])
+        return priority.pop(top), top
+
+    def peek(self) -> float:
+        """
+        :return: the lowest priority in the heap, inf if it is empty
+        """
+        return self.priority[self.heap[0]] if self.heap else float('inf')
+
+    def _sift_up(self, pos: int, item: int, p: float) -> None:
+        """
+        move item up from pos until its parent is not larger, then store it there
+        """
+        heap, priority, position = self.heap, self.priority, self.position
+        while pos > 0:
+            parent_pos = (pos - 1) >> 1
+            parent = heap[parent_pos]
+            q = priority[parent]
+            if q < p or (q == p and parent < item):
+                break
+            heap[pos] = parent
+            position[parent] = pos
+            pos = parent_pos
+        heap[pos] = item
+        position[item] = pos
+
+    def _sift_down(self, pos: int, item: int, p: float) -> None:
+        """
+        move item down from pos until both its children are not smaller, then store it there
+        """
+        heap, priority, position = self.heap, self.priority, self.position
+        size = len(heap)
+        child_pos = 2 * pos + 1
+        while child_pos < size:
+            child = heap[child_pos]
+            q = priority[child]
+            right_pos = child_pos + 1
+            if right_pos < size:
+                right = heap[right_pos]
+                r = priority[right]
+                if r < q or (r == q and right < child):
+                    child_pos, child, q = right_pos, right, r
+            if p < q or (p == q and item < child):
+                break
+            heap[pos] = child
+            position[child] = pos
+            pos = child_pos
+            child_pos = 2 * pos + 1
+        heap[pos] = item
+        position[item] = pos
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, item: int):
+        return item in self.position
+
+    def __repr__(self):
+        return f"IndexedHeap[size:{len(self.heap)}]"
@@ -0,0 +1,99 @@
+import json
+import math
+
+
+class LandmarkIndex:
+    """
+    This class represent the preprocessing of the ALT algorithm (A*, Landmarks, Triangle inequality):
+    for a few landmark vertices L it keeps d(L,v) and d(v,L) for every vertex v, by the triangle
+    inequality d(v,t) >= d(L,t) - d(L,v) and d(v,t) >= d(v,L) - d(t,L), the best of these bounds
+    is a consistent A* heuristic towards t.
+    the index belongs to one state of one graph object (its mode count), it is stale once the graph changes.
+    a saved index keeps the fingerprint of the graph (CSRGraph.fingerprint) instead, the mode count of a graph
+    loaded from a file tells nothing about its content
+    """
+
+    def __init__(self, landmarks: list, forward: list, backward: list, graph=None, fingerprint: int = None):
+        """
+        :param landmarks: the keys of the landmarks
+        :param forward: for each landmark a dictionary vertex -> d(landmark, vertex) (reachable vertices only)
+        :param backward: for each landmark a dictionary vertex -> d(vertex, landmark)
+        :param graph: the graph the index was built on, None for an index loaded from a file (see attach)
+        :param fingerprint: the fingerprint of that graph, read from the file of a loaded index
+        """
+        self.landmarks = landmarks
+        self.forward = forward
+        self.backward = backward
+        self.fingerprint = fingerprint
+        self.graph = None
+        self.mc = None
+        if graph is not None:
+            self.attach(graph)
+
+    def attach(self, graph) -> None:
+        """
+        tie the index to a graph as it is now (the caller checked that the index matches it)
+        :param graph: GraphInterface
+        """
+        self.graph = graph
+        self.mc = graph.get_mc()
+
+    def is_valid_for(self, graph) -> bool:
+        """
+        :param graph: GraphInterface
+        :return: true if the index was built on this graph object as it is now
+        """
+        return graph is not None and graph is self.graph and graph.get_mc() == self.mc
+
+    def heuristic(self, dest: int):
+        """
+        :param dest: the key of the destination of the query
+        :return: function vertex key -> lower bound of d(vertex, dest), inf if the landmarks prove
+                 that dest can not be reached from the vertex
+        """
+        bounds = [(f, b, f.get(dest, math.inf), b.get(dest, math.inf)) for f, b in zip(self.forward, self.backward)]
+
+        def lower_bound(v: int) -> float:
+            best = 0.0
+            for forward, backward, to_dest, from_dest in bounds:
+                to_v = forward.get(v, math.inf)
+                if to_v != math.inf:  # d(L,dest) - d(L,v)
+                    if to_dest == math.inf:
+                        return math.inf  # L reaches v and not dest, so v can not reach dest
+                    if to_dest - to_v > best:
+                        best = to_dest - to_v
+                if from_dest != math.inf:  # d(v,L) - d(dest,L)
+                    from_v = backward.get(v, math.inf)
+                    if from_v == math.inf:
+                        return math.inf  # dest reaches L and v does not, so v can not reach dest
+                    if from_v - from_dest > best:
+                        best = from_v - from_dest
+            return best
+
+        return lower_bound
+
+    def save(self, file_name: str, fingerprint: int) -> None:
+        """
+        save the index into a json file, the convention is to keep it next to the graph file
+        (for example "A5" -> "A5.landmarks")
+        :param file_name: the path of the file
+        :param fingerprint: the fingerprint of the graph the index was built on
+        """
+        with open(file_name, "w") as file:
+            json.dump({"fingerprint": fingerprint, "landmarks": self.landmarks,
+                       "forward": [list(f.items()) for f in self.forward],
+                       "backward": [list(b.items()) for b in self.backward]}, fp=file)
+
+    @classmethod
+    def load(cls, file_name: str) -> 'LandmarkIndex':
+        """
+        :param file_name: the path of a file written by save
+        :return: LandmarkIndex
+        """
+        with open(file_name, "r") as file:
+            data = json.load(file)
+        return cls(data["landmarks"], [dict((k, d) for k, d in f) for f in data["forward"]],
+                   [dict((k, d) for k, d in b) for b in data["backward"]], fingerprint=data["fingerprint"])
+
+    def __repr__(self):
+        return f"LandmarkIndex[landmarks:{self.landmarks},mc:{self.mc}]"
@@ -4,7 +4,9 @@ import math
 class NodeData:
     """
     This class represent an Node(vertex) in the graph each Node has a unique key
+    the class uses __slots__ (no per instance __dict__), the algorithms keep their own state
     """
+    __slots__ = ("key", "info", "tag", "pos")
 
     def __init__(self, key: int, info: str = "", tag: int = 0, pos: tuple = None):
         """
@@ -18,10 +20,6 @@ class NodeData:
         self.info = info
         self.tag = tag
         self.pos = pos
-        # -------algorithms variable field-------
-        self.visited = False
-        self.w = -1
-        self.t = -1
 
     def get_x(self) -> float:
         if self.pos is not None:
@@ -0,0 +1,180 @@
+from src import GraphInterface
+
+
+class SCCIndex:
+    """
+    This class represent the strongly connected components of a graph, kept up to date between calls
+    from the change journal of the graph (DiGraph.changes_since) instead of running trajan's algorithm again:
+    deletions can only split the component they are in - that component alone is computed again,
+    insertions can only merge components - an edge u->v merges every component that is on a path from v to u.
+    the components that were not touched keep their order, new and changed components come last
+    (their order may differ from the one a full trajan's run would give)
+    """
+    max_changes = 64  # more changes than this are handled by a full run
+
+    def __init__(self, graph: GraphInterface, components: list):
+        """
+        :param graph: the graph the components belong to
+        :param components: list of the components (lists of node keys), for example the result of Trajans()
+        """
+        self.graph = graph
+        self.mc = graph.get_mc()
+        self.members = {}  # component id -> list of its node keys
+        self.component_of = {}  # node key -> component id
+        self.next_id = 0
+        for scc in components:
+            self._add(scc)
+
+    def _add(self, scc: list) -> int:
+        """
+        :return: the id of the new component
+        """
+        cid = self.next_id
+        self.next_id += 1
+        self.members[cid] = scc
+        for key in scc:
+            self.component_of[key] = cid
+        return cid
+
+    def components(self) -> list:
+        """
+        :return: list of the components (the lists are not copies)
+        """
+        return list(self.members.values())
+
+    def component_id(self, key: int) -> int or None:
+        """
+        :return: the id of the component of key (two nodes are strongly connected iff their ids are equal),
+                 None if key is not in the graph
+        """
+        return self.component_of.get(key)
+
+    def component(self, key: int) -> list:
+        """
+        :return: the component of key (not a copy), empty list if key is not in the graph
+        """
+        cid = self.component_of.get(key)
+        return self.members[cid] if cid is not None else []
+
+    def update(self) -> bool:
+        """
+        bring the components up to date with the graph
+        :return: false if the changes can not be applied (no journal, it does not go back far enough or there
+                 are too many changes), then the index must be built again
+        """
+        graph = self.graph
+        if graph.get_mc() == self.mc:
+            return True
+        changes = graph.changes_since(self.mc) if hasattr(graph, "changes_since") else None
+        if changes is None or len(changes) > self.max_changes:
+            return False
+        dirty = set()  # components that may split
+        inserted = []
+        added = []
+        for mc, operation, id1, id2 in changes:
+            if operation == "add_edge":
+                inserted.append((id1, id2))
+            elif operation == "remove_edge":
+                if id1 in self.component_of and self.component_of[id1] == self.component_of.get(id2):
+                    dirty.add(self.component_of[id1])
+            elif id1 in self.component_of:  # a node was added back or removed
+                dirty.add(self.component_of[id1])
+            elif operation == "add_node":
+                added.append(id1)
+        for cid in dirty:
+            scc = self.members.pop(cid)
+            alive = set()
+            for key in scc:
+                del self.component_of[key]
+                if graph.get_node(key) is not None:
+                    alive.add(key)
+            for part in self._tarjan(alive):
+                self._add(part)
+        for key in added:  # new nodes start as components of their own
+            if key not in self.component_of and graph.get_node(key) is not None:
+                self._add([key])
+        for u, v in inserted:
+            if self.component_of.get(u) != self.component_of.get(v) and graph.get_edge(u, v) is not None:
+                self._merge_cycle(u, v)
+        self.mc = graph.get_mc()
+        return True
+
+    def _merge_cycle(self, u: int, v: int) -> None:
+        """
+        the edge u->v was added, merge the components of every node that v reaches and that reaches u
+        """
+        graph = self.graph
+        forward = self._reach(v, graph.all_out_edges_of_node)
+        if u not in forward:  # no new cycle
+            return
+        backward = self._reach(u, graph.all_in_edges_of_node)
+        cids = {self.component_of[key] for key in forward if key in backward}
+        merged = []
+        for cid in sorted(cids):
+            merged.extend(self.members.pop(cid))
+        self._add(merged)
+
+    @staticmethod
+    def _reach(start: int, neighbors) -> set:
+        """
+        :param neighbors: function node key -> its out (or in) neighbors
+        :return: the set of nodes reachable from start
+        """
+        seen = {start}
+        stack = [start]
+        while stack:
+            for key in neighbors(stack.pop()):
+                if key not in seen:
+                    seen.add(key)
+                    stack.append(key)
+        return seen
+
+    def _tarjan(self, keys: set) -> list:
+        """
+        iterative trajan's algorithm over the subgraph induced by keys
+        :return: list of the components of that subgraph
+        """
+        out = self.graph.all_out_edges_of_node
+        index, lowlink = {}, {}
+        on_stack = set()
+        stack, comps = [], []
+        for root in keys:
+            if root in index:
+                continue
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            call_stack = [(root, iter(out(root)))]
+            while call_stack:
+                v, neighbors = call_stack[-1]
+                for w in neighbors:
+                    if w not in keys:
+                        continue
+                    if w not in index:  # go deeper
+                        index[w] = lowlink[w] = len(index)
+                        stack.append(w)
+                        on_stack.add(w)
+                        call_stack.append((w, iter(out(w))))
+                        break
+                    if w in on_stack and index[w] < lowlink[v]:
+                        lowlink[v] = index[w]
+                else:  # all the neighbors of v are done
+                    call_stack.pop()
+                    if call_stack and lowlink[v] < lowlink[call_stack[-1][0]]:
+                        lowlink[call_stack[-1][0]] = lowlink[v]
+                    if lowlink[v] == index[v]:  # v is the root of a component
+                        scc = []
+                        while True:
+                            w = stack.pop()
+                            on_stack.discard(w)
+                            scc.append(w)
+                            if w == v:
+                                break
+                        comps.append(scc)
+        return comps
+
+    def __len__(self):
+        return len(self.members)
+
+    def __repr__(self):
+        return f"SCCIndex[components:{len(self.members)},mc:{self.mc}]"
@@ -0,0 +1,61 @@
+class ShortestPathTree:
+    """
+    This class represent the result of a single source Dijkstra's run, it holds the distance
+    and the parent of every vertex that was settled from the source so that the shortest path
+    to any of them can be rebuilt without running the algorithm again
+    """
+
+    def __init__(self, src: int, dist: dict, parent: dict, complete: bool = True):
+        """
+        :param src: the key of the source vertex
+        :param dist: dictionary of vertex key -> distance from src
+        :param parent: dictionary of vertex key -> the previous vertex on its shortest path (None for src)
+        :param complete: false if the search stopped early, then only the settled vertices are known
+        """
+        self.src = src
+        self.dist = dist
+        self.parent = parent
+        self.complete = complete
+
+    def covers(self, dest: int) -> bool:
+        """
+        :param dest: the key of the destination vertex
+        :return: true if this tree can answer a query for dest without running the search again
+        """
+        return self.complete or dest in self.dist
+
+    def has_path(self, dest: int) -> bool:
+        """
+        :param dest: the key of the destination vertex
+        :return: true if dest is reachable from the source
+        """
+        return dest in self.dist
+
+    def distance(self, dest: int) -> float:
+        """
+        :param dest: the key of the destination vertex
+        :return: the weight of the shortest path from the source to dest, inf if there is no path
+        """
+        return self.dist.get(dest, float('inf'))
+
+    def path(self, dest: int) -> (float, list):
+        """
+        rebuild the shortest path by walking the parent map back from dest, O(path length)
+        :param dest: the key of the destination vertex
+        :return: the weight of the path and the list of the vertices on it, (inf, []) if there is no path
+        """
+        if dest not in self.dist:  # dest was never reached - there is no path
+            return (float('inf'), [])
+        path = []
+        key = dest
+        while key is not None:
+            path.append(key)
+            key = self.parent[key]
+        path.reverse()
+        return (self.dist[dest], path)
+
+    def __len__(self):
+        return len(self.dist)
+
+    def __repr__(self):
+        return f"ShortestPathTree[src:{self.src},reached:{len(self.dist)}]"
@@ -0,0 +1,49 @@
+import numpy as np
+
+try:  # optional backend, without it the "scipy" SCC method falls back to trajan's algorithm
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import connected_components as sparse_components
+except ImportError:
+    csr_matrix = None
+    sparse_components = None
+
+
+def available() -> bool:
+    """
+    :return: true if scipy is installed
+    """
+    return csr_matrix is not None
+
+
+def adjacency_matrix(offsets, targets):
+    """
+    export the out edges as a scipy CSR matrix (no copy of the index arrays), every entry is 1 -
+    the weights are not used and a 0 weight would be dropped by scipy as an implicit zero
+    :param offsets: n+1 offsets into targets
+    :param targets: index of the destination of each out edge
+    :return: n x n scipy.sparse.csr_matrix
+    """
+    n = len(offsets) - 1
+    indptr = np.frombuffer(offsets, dtype=np.int64)
+    indices = np.frombuffer(targets, dtype=np.int64)
+    return csr_matrix((np.ones(len(indices), dtype=np.int8), indices, indptr), shape=(n, n))
+
+
+def strong_components(matrix, keys) -> list:
+    """
+    run the compiled strongly connected components routine of scipy and map its labels back to node keys
+    :param matrix: the adjacency matrix of adjacency_matrix
+    :param keys: the key of each vertex by its index
+    :return: list of the components (lists of node keys), the components are ordered by label
+             and the nodes of each component by vertex index
+    """
+    if matrix.shape[0] == 0:
+        return []
+    count, labels = sparse_components(matrix, directed=True, connection="strong")
+    order = np.argsort(labels, kind="stable").tolist()
+    comps = []
+    start = 0
+    for size in np.bincount(labels, minlength=count).tolist():  # the keys are not cast, any key type is kept
+        comps.append([keys[i] for i in order[start:start + size]])
+        start += size
+    return comps